@@ -0,0 +1,114 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Seeded synthetic data for the benchmark suite.
+
+Every generated record is named with the `BENCH-` prefix so it can be removed again.
+"""
+
+import random
+
+import frappe
+from frappe.utils import add_days, getdate
+
+from compliance_plus.compliance_plus.custom.bulk_mail import bulk_insert, get_standard_fields
+from compliance_plus.compliance_plus.custom.tracker_status import STATUS_TRACKERS
+
+PREFIX = "BENCH-"
+LICENSE_DOCTYPES = ("Drug License Details", "FSSAI Details")
+
+# share of rows per expiry bucket, and the day offsets (from today) each bucket covers
+DEFAULT_EXPIRY_MIX = {"expired": 0.1, "expiring": 0.2, "later": 0.7}
+EXPIRY_BUCKETS = {"expired": (-365, -1), "expiring": (0, 30), "later": (31, 730)}
+
+
+def generate(customers=1000, licenses_per_customer=2, trackers=1000, expiry_mix=None, seed=42):
+	"""Insert N customers x M Drug License / FSSAI rows and K tracker records."""
+	rng = random.Random(seed)
+	expiry_mix = expiry_mix or DEFAULT_EXPIRY_MIX
+	today = getdate()
+
+	def expiry_date():
+		bucket = rng.choices(list(expiry_mix), weights=list(expiry_mix.values()))[0]
+		return add_days(today, rng.randint(*EXPIRY_BUCKETS[bucket]))
+
+	customer_group = frappe.db.get_value("Customer Group", {"is_group": 0})
+	territory = frappe.db.get_value("Territory", {"is_group": 0})
+	customer_names = [f"{PREFIX}CUST-{i:07d}" for i in range(int(customers))]
+
+	bulk_insert(
+		"Customer",
+		[
+			dict(
+				get_standard_fields(),
+				name=name,
+				customer_name=name,
+				customer_type="Company",
+				customer_group=customer_group,
+				territory=territory,
+				email_id=f"{name.lower()}@example.com" if rng.random() < 0.9 else None,
+				disabled=0,
+			)
+			for name in customer_names
+		],
+	)
+
+	customer_meta = frappe.get_meta("Customer")
+	for doctype in LICENSE_DOCTYPES:
+		parentfield = next(df.fieldname for df in customer_meta.get_table_fields() if df.options == doctype)
+		bulk_insert(
+			doctype,
+			[
+				dict(
+					get_standard_fields(),
+					name=f"{PREFIX}{parent[len(PREFIX) :]}-{doctype[:2]}-{idx}",
+					parent=parent,
+					parenttype="Customer",
+					parentfield=parentfield,
+					idx=idx,
+					license_number=f"{doctype[:2].upper()}-{parent}-{idx}",
+					expiry_date=expiry_date(),
+				)
+				for parent in customer_names
+				for idx in range(1, int(licenses_per_customer) + 1)
+			],
+		)
+
+	if not frappe.db.exists("Compliance Category", f"{PREFIX}Category"):
+		frappe.get_doc({"doctype": "Compliance Category", "category_name": f"{PREFIX}Category"}).insert()
+
+	doctypes = list(STATUS_TRACKERS.items())
+	per_doctype = int(trackers) // len(doctypes)
+	for doctype, date_field in doctypes:
+		bulk_insert(
+			doctype,
+			[
+				dict(
+					get_standard_fields(),
+					name=f"{PREFIX}{doctype[:3].upper()}-{i:07d}",
+					document_name=f"Benchmark {doctype} {i}",
+					issuer_supplier="Benchmark Authority",
+					issue_date=add_days(today, -400),
+					start_date=add_days(today, -400),
+					compliance_category=f"{PREFIX}Category",
+					status="Active",
+					in_charge="Administrator",
+					enable_reminder=1,
+					remind_before_days=rng.choice([7, 15, 30]),
+					**{date_field: expiry_date()},
+				)
+				for i in range(per_doctype)
+			],
+		)
+
+	frappe.db.commit()
+
+
+def cleanup():
+	"""Remove everything `generate` created."""
+	frappe.db.delete("Communication", {"reference_name": ["like", f"{PREFIX}%"]})
+	frappe.db.delete("Reminder Ledger", {"customer": ["like", f"{PREFIX}%"]})
+	for doctype in (*LICENSE_DOCTYPES, "Customer", *STATUS_TRACKERS):
+		frappe.db.delete(doctype, {"name": ["like", f"{PREFIX}%"]})
+	frappe.db.delete("Compliance Category", {"name": f"{PREFIX}Category"})
+	frappe.db.commit()
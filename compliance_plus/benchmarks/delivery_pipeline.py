@@ -0,0 +1,46 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Throughput benchmark for the SMTP delivery pipeline against the local stand-in.
+
+Run with:
+
+	bench --site <site> execute compliance_plus.benchmarks.delivery_pipeline.run --kwargs "{'messages': 20000}"
+"""
+
+import smtplib
+import time
+
+import frappe
+
+from compliance_plus.benchmarks.smtp_stand_in import SMTPStandIn
+from compliance_plus.benchmarks.template_render import TEMPLATE, get_context
+from compliance_plus.compliance_plus.custom.delivery_pipeline import DeliveryPipeline, build_email
+from compliance_plus.compliance_plus.custom.license_tracker_cron import get_compiled_template
+
+
+def run(messages=20000, connections=(1, 4, 8)):
+	"""Render and send `messages` reminders with each connection count and report messages per second."""
+	template = frappe._dict(name="Benchmark Template", modified="2025-01-01 00:00:00", response=TEMPLATE)
+	compiled = get_compiled_template(template)
+	context = get_context()
+
+	def render(idx):
+		html = compiled.render(context)
+		return build_email("reminders@example.com", f"customer{idx}@example.com", "Reminder", html)
+
+	results = {}
+	for count in connections:
+		with SMTPStandIn() as server:
+			pipeline = DeliveryPipeline(lambda: smtplib.SMTP(server.host, server.port), connections=count)
+			start = time.perf_counter()
+			deliveries = pipeline.run(range(int(messages)), render)
+			wall_time = time.perf_counter() - start
+
+		results[count] = {
+			"wall_time_s": round(wall_time, 3),
+			"messages_per_s": round(len(server.messages) / wall_time, 1),
+			"failed": sum(1 for delivery in deliveries if delivery.status == "Failed"),
+		}
+
+	return results
@@ -0,0 +1,106 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Local SMTP stand-in for delivery tests and benchmarks.
+
+Accepts every message on 127.0.0.1 and records it instead of relaying it:
+
+	with SMTPStandIn() as server:
+		smtplib.SMTP(server.host, server.port).sendmail(...)
+		server.messages
+"""
+
+import socketserver
+import threading
+import time
+
+import frappe
+
+
+class SMTPStandIn:
+	"""Minimal threaded SMTP server that keeps each message with the time it arrived."""
+
+	def __init__(self, host="127.0.0.1", port=0, clock=time.monotonic, fail_data=0, reject=()):
+		self.clock = clock
+		# answer the first `fail_data` messages with a temporary failure, and refuse `reject` recipients
+		self.fail_data = fail_data
+		self.reject = set(reject)
+		self.messages = []
+		self.connections = 0
+		self.open_connections = 0
+		self.peak_connections = 0
+		self.lock = threading.Lock()
+		self.server = socketserver.ThreadingTCPServer((host, port), self.get_handler())
+		self.server.daemon_threads = True
+		self.host, self.port = self.server.server_address
+
+	def __enter__(self):
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+		return self
+
+	def __exit__(self, *exc):
+		self.server.shutdown()
+		self.server.server_close()
+
+	def get_handler(self):
+		stand_in = self
+
+		class Handler(socketserver.StreamRequestHandler):
+			disable_nagle_algorithm = True
+
+			def reply(self, line):
+				self.wfile.write(f"{line}\r\n".encode())
+
+			def handle(self):
+				with stand_in.lock:
+					stand_in.connections += 1
+					stand_in.open_connections += 1
+					stand_in.peak_connections = max(stand_in.peak_connections, stand_in.open_connections)
+				try:
+					self.converse()
+				finally:
+					with stand_in.lock:
+						stand_in.open_connections -= 1
+
+			def converse(self):
+				envelope = frappe._dict(mail_from=None, rcpt_tos=[])
+				self.reply("220 stand-in ESMTP")
+
+				while line := self.rfile.readline():
+					command = line.decode().strip()
+					verb = command[:4].upper()
+					if verb in ("EHLO", "HELO"):
+						self.reply("250 stand-in")
+					elif verb == "MAIL":
+						envelope = frappe._dict(mail_from=command.split(":", 1)[1].strip(), rcpt_tos=[])
+						self.reply("250 OK")
+					elif verb == "RCPT":
+						recipient = command.split(":", 1)[1].strip()
+						if recipient.strip("<>") in stand_in.reject:
+							self.reply("550 No such user")
+							continue
+						envelope.rcpt_tos.append(recipient)
+						self.reply("250 OK")
+					elif verb == "DATA":
+						self.reply("354 End data with <CR><LF>.<CR><LF>")
+						data = []
+						while (data_line := self.rfile.readline()) not in (b".\r\n", b""):
+							# undo the client's dot-stuffing
+							data.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+						with stand_in.lock:
+							fail = stand_in.fail_data > 0
+							stand_in.fail_data -= fail
+							if not fail:
+								stand_in.messages.append(
+									frappe._dict(envelope, data=b"".join(data), received_at=stand_in.clock())
+								)
+						self.reply("451 Try again later" if fail else "250 OK")
+					elif verb in ("RSET", "NOOP"):
+						self.reply("250 OK")
+					elif verb == "QUIT":
+						self.reply("221 Bye")
+						break
+					else:
+						self.reply("502 Command not implemented")
+
+		return Handler
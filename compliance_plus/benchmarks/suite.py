@@ -0,0 +1,133 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Benchmark suite for the reminder cron and License Tracker Report.
+
+Run against a scratch site, never production:
+
+	bench --site <site> execute compliance_plus.benchmarks.suite.run --kwargs "{'scales': [1000, 10000]}"
+
+Each scale reports wall time, query count and peak Python memory per target. Results
+are written to `output` (JSON) together with the app commit, and two result files can
+be diffed with `compare` to catch regressions before a release.
+"""
+
+import json
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import frappe
+from frappe.utils.change_log import get_app_last_commit_ref
+
+from compliance_plus.benchmarks import data
+from compliance_plus.compliance_plus.custom.profiling import QueryCounter
+
+ENQUEUE_ARGS = ("queue", "job_id", "deduplicate", "now", "timeout", "is_async", "job_name")
+
+
+def run(scales=(1000, 10000, 100000), licenses_per_customer=2, trackers_per_customer=1, output=None, seed=42):
+	results = {"commit": get_app_last_commit_ref("compliance_plus"), "scales": {}}
+
+	for scale in scales:
+		data.cleanup()
+		data.generate(
+			customers=scale,
+			licenses_per_customer=licenses_per_customer,
+			trackers=scale * trackers_per_customer,
+			seed=seed,
+		)
+		try:
+			results["scales"][str(scale)] = {
+				"send_license_expiry_reminders": measure(run_cron),
+				"license_tracker_report": measure(run_report),
+			}
+		finally:
+			data.cleanup()
+
+	if output:
+		with open(output, "w") as f:
+			f.write(frappe.as_json(results))
+	return results
+
+
+def measure(fn):
+	tracemalloc.start()
+	start = time.perf_counter()
+	with QueryCounter() as counter:
+		fn()
+	wall_time = time.perf_counter() - start
+	_current, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	frappe.db.rollback()
+
+	return {
+		"wall_time_s": round(wall_time, 3),
+		"queries": counter.count,
+		"peak_memory_mb": round(peak / 1024 / 1024, 2),
+	}
+
+
+def run_cron():
+	from compliance_plus.compliance_plus.custom import license_tracker_cron
+
+	def run_inline(method, **kwargs):
+		for arg in ENQUEUE_ARGS:
+			kwargs.pop(arg, None)
+		frappe.get_attr(method)(**kwargs)
+
+	# the SMTP pipeline would email every generated customer, measure the Email Queue path
+	smtp_pipeline = frappe.db.get_single_value("Compliance Plus Settings", "smtp_pipeline")
+	frappe.db.set_single_value("Compliance Plus Settings", "smtp_pipeline", 0)
+	try:
+		with (
+			patch.object(license_tracker_cron.frappe, "enqueue", side_effect=run_inline),
+			patch.object(
+				license_tracker_cron,
+				"queue_emails",
+				side_effect=lambda messages, sender, email_account=None: messages,
+			),
+			patch.object(
+				license_tracker_cron, "deliver_reminders", side_effect=RuntimeError("SMTP pipeline")
+			),
+			patch.object(license_tracker_cron.frappe.db, "commit"),
+		):
+			license_tracker_cron.send_license_expiry_reminders()
+	finally:
+		frappe.db.set_single_value("Compliance Plus Settings", "smtp_pipeline", smtp_pipeline)
+
+
+def run_report():
+	from compliance_plus.compliance_plus.report.license_tracker_report import license_tracker_report
+
+	license_tracker_report.clear_report_cache()
+	license_tracker_report.execute({})
+	license_tracker_report.execute({"expiry_in_30_days": 1})
+
+
+def compare(base, head, tolerance=0.2):
+	"""Print metrics in `head` that are more than `tolerance` worse than in `base`."""
+	with open(base) as f:
+		base = json.load(f)
+	with open(head) as f:
+		head = json.load(f)
+
+	regressions = []
+	for scale, targets in head["scales"].items():
+		for target, metrics in targets.items():
+			baseline = base["scales"].get(scale, {}).get(target)
+			if not baseline:
+				continue
+			for metric, value in metrics.items():
+				if baseline[metric] and value > baseline[metric] * (1 + tolerance):
+					regressions.append(
+						{
+							"scale": scale,
+							"target": target,
+							"metric": metric,
+							"base": baseline[metric],
+							"head": value,
+						}
+					)
+
+	return regressions
@@ -0,0 +1,61 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+"""Micro-benchmark for reminder email rendering.
+
+Run with:
+
+	bench --site <site> execute compliance_plus.benchmarks.template_render.run
+"""
+
+from datetime import date, timedelta
+from timeit import timeit
+
+import frappe
+
+from compliance_plus.compliance_plus.custom.license_tracker_cron import get_compiled_template
+
+TEMPLATE = """
+<p>Dear {{ doc.customer_name }},</p>
+<p>The following licences held with {{ doc.company }} expire soon:</p>
+<table>
+{% for row in doc.fsl_dl_details %}
+	<tr><td>Drug License</td><td>{{ row.license_number }}</td><td>{{ row.expiry_date }}</td></tr>
+{% endfor %}
+{% for row in doc.fsl_fssai_details %}
+	<tr><td>FSSAI</td><td>{{ row.license_number }}</td><td>{{ row.expiry_date }}</td></tr>
+{% endfor %}
+</table>
+"""
+
+
+def get_context():
+	expiry_date = date.today() + timedelta(days=10)
+	return {
+		"doc": {
+			"customer_name": "Benchmark Customer",
+			"company": "Benchmark Company",
+			"fsl_dl_details": [{"license_number": f"DL-{i}", "expiry_date": expiry_date} for i in range(3)],
+			"fsl_fssai_details": [
+				{"license_number": f"FS-{i}", "expiry_date": expiry_date} for i in range(2)
+			],
+		}
+	}
+
+
+def run(iterations=2000):
+	"""Compare per-call `frappe.render_template` with the compile-once cache."""
+	iterations = int(iterations)
+	template = frappe._dict(name="Benchmark Template", modified="2025-01-01 00:00:00", response=TEMPLATE)
+	context = get_context()
+
+	per_call = timeit(lambda: frappe.render_template(template.response, context), number=iterations)
+	compiled = timeit(lambda: get_compiled_template(template).render(context), number=iterations)
+
+	result = {
+		"iterations": iterations,
+		"render_template_ms": round(per_call * 1000, 2),
+		"compiled_ms": round(compiled * 1000, 2),
+		"speedup": round(per_call / compiled, 1) if compiled else None,
+	}
+	return result
@@ -0,0 +1,24 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.benchmarks import data
+
+
+class TestBenchmarkData(FrappeTestCase):
+	def tearDown(self):
+		"""Clean up after tests."""
+		data.cleanup()
+
+	def test_generate_and_cleanup(self):
+		"""Test that the generator creates the requested volumes and cleanup removes them."""
+		data.generate(customers=10, licenses_per_customer=2, trackers=10, seed=1)
+
+		self.assertEqual(frappe.db.count("Customer", {"name": ["like", "BENCH-%"]}), 10)
+		self.assertEqual(frappe.db.count("Drug License Details", {"parent": ["like", "BENCH-%"]}), 20)
+		self.assertEqual(frappe.db.count("Licence Tracker", {"name": ["like", "BENCH-%"]}), 2)
+
+		data.cleanup()
+		self.assertEqual(frappe.db.count("Customer", {"name": ["like", "BENCH-%"]}), 0)
@@ -0,0 +1,48 @@
+import csv
+import json
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("import-trackers")
+@click.argument("doctype")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", type=int, default=1000, help="Rows validated and inserted per batch")
+@click.option(
+	"--errors", "errors_path", type=click.Path(dir_okay=False), help="Write rejected rows to this CSV file"
+)
+@pass_context
+def import_trackers(context, doctype, path, batch_size, errors_path):
+	"""Bulk import tracker documents from a CSV or JSON file of fieldname columns."""
+	import frappe
+
+	from compliance_plus.compliance_plus.custom.bulk_import import bulk_import
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		with open(path, newline="") as file:
+			# stream CSV rows so the whole register is never held in memory
+			rows = json.load(file) if path.endswith(".json") else csv.DictReader(file)
+			result = bulk_import(doctype, rows, batch_size)
+	finally:
+		frappe.destroy()
+
+	click.secho(f"Imported {len(result.imported)} {doctype} documents", fg="green")
+	if not result.errors:
+		return
+
+	click.secho(f"{len(result.errors)} rows were rejected", fg="red")
+	for error in result.errors[:20]:
+		click.echo(f"Row {error['row']}: {'; '.join(error['errors'])}")
+
+	if errors_path:
+		with open(errors_path, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(["Row", "Errors"])
+			writer.writerows([error["row"], "; ".join(error["errors"])] for error in result.errors)
+		click.echo(f"All rejected rows written to {errors_path}")
+
+
+commands = [import_trackers]
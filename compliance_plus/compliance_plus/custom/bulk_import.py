@@ -0,0 +1,206 @@
+import json
+import logging
+from itertools import islice
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields
+from frappe.utils import cint, flt, get_datetime, getdate
+
+from compliance_plus.compliance_plus.custom.bulk_mail import bulk_insert, get_standard_fields
+from compliance_plus.compliance_plus.custom.dashboard import clear_dashboard_cache
+from compliance_plus.compliance_plus.custom.expiry_index import index_trackers
+from compliance_plus.compliance_plus.custom.naming import reserve_series_block
+from compliance_plus.compliance_plus.custom.renewal_projection import clear_projection_cache
+from compliance_plus.compliance_plus.custom.tracker_reminders import REMINDER_TRACKERS
+from compliance_plus.compliance_plus.custom.tracker_status import STATUS_TRACKERS, update_status
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+@frappe.whitelist(methods=["POST"])
+def import_trackers(doctype, rows, batch_size=BATCH_SIZE):
+	"""Bulk-create tracker documents from a list of field -> value dicts."""
+	frappe.has_permission(doctype, "create", throw=True)
+	rows = json.loads(rows) if isinstance(rows, str) else rows
+	return bulk_import(doctype, rows, cint(batch_size) or BATCH_SIZE)
+
+
+def bulk_import(doctype, rows, batch_size=BATCH_SIZE):
+	"""Validate and insert `rows` batch by batch, committing after each batch.
+
+	Every batch is validated with one Link lookup per Link field, named from one block of
+	its naming series and inserted with multi-row statements. Returns the imported names and
+	the rejected rows with their errors, numbered from 1 in input order.
+	"""
+	if doctype not in REMINDER_TRACKERS:
+		frappe.throw(_("{0} is not a tracker DocType").format(doctype))
+
+	rules = get_field_rules(doctype)
+	result = frappe._dict(imported=[], errors=[])
+	rows = iter(rows)
+	row_number = 1
+
+	while batch := list(islice(rows, batch_size)):
+		docs, errors = validate_batch(rules, batch, row_number)
+		names, insert_errors = insert_batch(doctype, docs)
+		result.imported.extend(names)
+		result.errors.extend(sorted(errors + insert_errors, key=lambda error: error["row"]))
+		frappe.db.commit()
+		row_number += len(batch)
+		logger.info(f"Imported {len(result.imported)} {doctype} rows, {len(result.errors)} rejected")
+
+	if result.imported:
+		clear_dashboard_cache()
+		clear_projection_cache()
+
+	return result
+
+
+def get_field_rules(doctype):
+	"""Collect what batch validation needs from the DocType once per import."""
+	meta = frappe.get_meta(doctype)
+	fields = {df.fieldname: df for df in meta.fields if df.fieldtype not in no_value_fields}
+	series = fields["naming_series"].options.split("\n")
+
+	return frappe._dict(
+		fields=fields,
+		mandatory=[df.fieldname for df in fields.values() if df.reqd and df.fieldname != "naming_series"],
+		defaults={
+			fieldname: value
+			for fieldname, value in frappe.new_doc(doctype, as_dict=True).items()
+			if fieldname in fields and value not in (None, "")
+		},
+		series=[option for option in series if option],
+	)
+
+
+def validate_batch(rules, batch, first_row):
+	"""Return row number -> insert-ready dict for the valid rows, and an error entry for each invalid row."""
+	docs, errors = {}, []
+	links = get_existing_links(rules, batch)
+
+	# getdate and friends report bad values through msgprint as well as raising
+	mute_messages = frappe.flags.mute_messages
+	frappe.flags.mute_messages = True
+	try:
+		for row_number, row in enumerate(batch, start=first_row):
+			doc, row_errors = validate_row(rules, row, links)
+			if row_errors:
+				errors.append({"row": row_number, "errors": row_errors})
+			else:
+				docs[row_number] = doc
+	finally:
+		frappe.flags.mute_messages = mute_messages
+
+	return docs, errors
+
+
+def get_existing_links(rules, batch):
+	"""Resolve every Link value of the batch with a single lookup per Link field."""
+	links = {}
+	for fieldname, df in rules.fields.items():
+		if df.fieldtype != "Link":
+			continue
+		values = {row[fieldname] for row in batch if row.get(fieldname)}
+		links[fieldname] = (
+			set(frappe.get_all(df.options, filters={"name": ["in", list(values)]}, pluck="name"))
+			if values
+			else set()
+		)
+	return links
+
+
+def validate_row(rules, row, links):
+	doc = dict(rules.defaults)
+	errors = []
+
+	for fieldname, value in row.items():
+		df = rules.fields.get(fieldname)
+		if not df:
+			errors.append(_("Unknown field {0}").format(fieldname))
+			continue
+		try:
+			doc[fieldname] = parse_value(df, value)
+		except Exception:
+			errors.append(_("Invalid value '{0}' for {1}").format(value, _(df.label)))
+
+	for fieldname in rules.mandatory:
+		if doc.get(fieldname) in (None, ""):
+			errors.append(_("{0} is mandatory").format(_(rules.fields[fieldname].label)))
+
+	for fieldname, value in doc.items():
+		if value in (None, ""):
+			continue
+		df = rules.fields[fieldname]
+		if df.fieldtype == "Select" and fieldname != "naming_series" and value not in df.options.split("\n"):
+			errors.append(
+				_("{0} must be one of {1}").format(_(df.label), df.options.replace("\n", ", ").strip(", "))
+			)
+		elif df.fieldtype == "Link" and value not in links[fieldname]:
+			errors.append(_("{0} '{1}' does not exist").format(_(df.options), value))
+
+	if doc.get("naming_series") and doc["naming_series"] not in rules.series:
+		errors.append(_("Naming Series must be one of {0}").format(", ".join(rules.series)))
+	doc.setdefault("naming_series", rules.series[0])
+
+	return doc, errors
+
+
+def parse_value(df, value):
+	if value in (None, ""):
+		return None
+	if df.fieldtype == "Date":
+		return getdate(value)
+	if df.fieldtype == "Datetime":
+		return get_datetime(value)
+	if df.fieldtype in ("Int", "Check"):
+		return cint(value)
+	if df.fieldtype in ("Float", "Currency", "Percent"):
+		return flt(value)
+	return value
+
+
+def insert_batch(doctype, docs):
+	"""Name the batch from blocks of its naming series and insert it with multi-row statements.
+
+	doc_events are skipped, so statuses and index entries of the new trackers are derived here.
+	Returns the inserted names, and an error entry for each row the database rejected.
+	"""
+	by_series = {}
+	for doc in docs.values():
+		by_series.setdefault(doc["naming_series"], []).append(doc)
+
+	for series, series_docs in by_series.items():
+		names = reserve_series_block(series, len(series_docs), doctype)
+		for doc, name in zip(series_docs, names, strict=True):
+			doc.update(get_standard_fields(), name=name)
+
+	errors = []
+	if insert_rows(doctype, list(docs.values())):
+		# find the rows the database rejects, e.g. values too long for their column
+		for row_number, doc in list(docs.items()):
+			if error := insert_rows(doctype, [doc]):
+				errors.append({"row": row_number, "errors": [error]})
+				del docs[row_number]
+
+	names = [doc["name"] for doc in docs.values()]
+	if names:
+		if doctype in STATUS_TRACKERS:
+			default_days = frappe.db.get_single_value("Compliance Plus Settings", "expiry_threshold") or 15
+			update_status(doctype, STATUS_TRACKERS[doctype], getdate(), default_days, names)
+		index_trackers(doctype, names)
+	return names, errors
+
+
+def insert_rows(doctype, docs):
+	"""Insert `docs` in a savepoint. Returns the database error, after rolling back to it, if any."""
+	frappe.db.savepoint("bulk_import")
+	try:
+		bulk_insert(doctype, docs)
+	except Exception as e:
+		frappe.db.rollback(save_point="bulk_import")
+		return _("Could not be saved: {0}").format(e.args[-1] if e.args else e)
+	frappe.db.release_savepoint("bulk_import")
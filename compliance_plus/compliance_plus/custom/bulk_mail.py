@@ -0,0 +1,99 @@
+import frappe
+from frappe.email.doctype.email_queue.email_queue import QueueBuilder
+from frappe.utils import now_datetime
+
+
+def queue_emails(messages, sender, email_account=None):
+	"""Queue one email per message with multi-row inserts instead of an Email Queue insert each.
+
+	Each message is a dict with `recipients`, `subject` and `message`, and optionally `send_after`.
+	The queue rows are built by the same QueueBuilder `frappe.sendmail` uses, so the flush job sends
+	them unchanged, through `email_account` when given. Returns the messages that were queued.
+	"""
+	queue_rows = []
+	recipient_rows = []
+	queued = []
+
+	for message in messages:
+		builder = QueueBuilder(
+			recipients=message.recipients,
+			sender=sender,
+			subject=message.subject,
+			message=message.message,
+			send_after=message.get("send_after"),
+		)
+		recipients = builder.final_recipients()
+		if not recipients:
+			continue
+
+		queue = builder.as_dict(include_recipients=False)
+		queue.update(get_standard_fields(), status="Not Sent")
+		if email_account:
+			queue["email_account"] = email_account
+		queue_rows.append(queue)
+
+		for idx, recipient in enumerate(recipients, start=1):
+			recipient_rows.append(
+				dict(
+					get_standard_fields(),
+					parent=queue["name"],
+					parenttype="Email Queue",
+					parentfield="recipients",
+					idx=idx,
+					recipient=recipient,
+					status="Not Sent",
+				)
+			)
+		queued.append(message)
+
+	bulk_insert("Email Queue", queue_rows)
+	bulk_insert("Email Queue Recipient", recipient_rows)
+	return queued
+
+
+def insert_communications(messages):
+	"""Insert one Automated Message Communication per queued message, in a single statement.
+
+	Each message carries the `subject` and the `reference_doctype` / `reference_name` it is about.
+	"""
+	now = now_datetime()
+	bulk_insert(
+		"Communication",
+		[
+			dict(
+				get_standard_fields(now),
+				communication_type="Automated Message",
+				communication_date=now,
+				subject=message.subject,
+				content=message.subject,
+				sent_or_received="Sent",
+				reference_doctype=message.reference_doctype,
+				reference_name=message.reference_name,
+				status="Linked",
+				user=frappe.session.user,
+			)
+			for message in messages
+		],
+	)
+
+
+def get_standard_fields(now=None):
+	now = now or now_datetime()
+	return {
+		"name": frappe.generate_hash(length=10),
+		"owner": frappe.session.user,
+		"modified_by": frappe.session.user,
+		"creation": now,
+		"modified": now,
+		"docstatus": 0,
+		"idx": 0,
+	}
+
+
+def bulk_insert(doctype, rows):
+	if not rows:
+		return
+
+	columns = set(frappe.get_meta(doctype).get_valid_columns())
+	fields = sorted(columns & set().union(*rows))
+	frappe.db.bulk_insert(doctype, fields, [tuple(row.get(field) for field in fields) for row in rows])
@@ -0,0 +1,106 @@
+import frappe
+from frappe.utils import add_days, getdate
+
+from compliance_plus.compliance_plus.custom.tracker_status import STATUS_TRACKERS
+
+CACHE_KEY = "compliance_plus_dashboard"
+CACHE_TTL = 10 * 60
+CHART_WEEKS = 12
+
+
+def get_summary():
+	"""Status and expiry-bucket counts over all status trackers, cached for CACHE_TTL seconds."""
+	summary = frappe.cache().get_value(CACHE_KEY)
+	if summary is None:
+		summary = build_summary(getdate())
+		frappe.cache().set_value(CACHE_KEY, summary, expires_in_sec=CACHE_TTL)
+	return summary
+
+
+def build_summary(today):
+	"""One GROUP BY per tracker doctype yields every card value at once."""
+	summary = frappe._dict(
+		statuses={"Active": 0, "Expiring Soon": 0, "Expired": 0, "Renewing": 0},
+		due_in_30_days=0,
+	)
+	values = {"today": today, "in_30_days": add_days(today, 30)}
+
+	for doctype, date_field in STATUS_TRACKERS.items():
+		for row in frappe.db.sql(
+			f"""
+			select status, count(*) as total,
+				sum(`{date_field}` between %(today)s and %(in_30_days)s) as due_in_30_days
+			from `tab{doctype}`
+			group by status
+			""",
+			values,
+			as_dict=True,
+		):
+			if row.status in summary.statuses:
+				summary.statuses[row.status] += row.total
+			summary.due_in_30_days += int(row.due_in_30_days or 0)
+
+	summary.expirations_per_week = get_expirations_per_week(today)
+	return summary
+
+
+def get_expirations_per_week(today):
+	"""Weekly expiry counts for the coming weeks, from the Compliance Expiry Index in one query."""
+	week_start = add_days(today, -today.weekday())
+	rows = frappe.db.sql(
+		"""
+		select yearweek(due_date, 3) as week, count(*) as total
+		from `tabCompliance Expiry Index`
+		where due_date between %(from_date)s and %(until)s
+		group by yearweek(due_date, 3)
+		order by week
+		""",
+		{"from_date": week_start, "until": add_days(week_start, CHART_WEEKS * 7 - 1)},
+		as_dict=True,
+	)
+	counts = {row.week: row.total for row in rows}
+
+	weeks = []
+	for i in range(CHART_WEEKS):
+		day = add_days(week_start, i * 7)
+		year, week, _weekday = day.isocalendar()
+		weeks.append({"label": day.strftime("%d %b"), "total": counts.get(year * 100 + week, 0)})
+	return weeks
+
+
+def clear_dashboard_cache(doc=None, method=None):
+	frappe.cache().delete_value(CACHE_KEY)
+
+
+def check_tracker_permission():
+	"""The cards count every tracker doctype, so each one must be readable."""
+	for doctype in STATUS_TRACKERS:
+		frappe.has_permission(doctype, "read", throw=True)
+
+
+def get_card(value):
+	return {"value": value, "fieldtype": "Int"}
+
+
+@frappe.whitelist()
+def get_expired_trackers(filters=None):
+	check_tracker_permission()
+	return get_card(get_summary().statuses["Expired"])
+
+
+@frappe.whitelist()
+def get_expiring_soon_trackers(filters=None):
+	check_tracker_permission()
+	return get_card(get_summary().statuses["Expiring Soon"])
+
+
+@frappe.whitelist()
+def get_active_trackers(filters=None):
+	check_tracker_permission()
+	return get_card(get_summary().statuses["Active"])
+
+
+@frappe.whitelist()
+def get_trackers_due_in_30_days(filters=None):
+	check_tracker_permission()
+	return get_card(get_summary().due_in_30_days)
@@ -0,0 +1,72 @@
+import logging
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+
+logger = logging.getLogger(__name__)
+
+# Email Account -> token bucket state, shared by every run that sends through it
+BUCKET_KEY = "compliance_plus_send_bucket"
+
+
+class TokenBucket:
+	"""Token bucket over an explicit clock: `rate` tokens per second, at most `capacity` saved up.
+
+	`reserve` never blocks. It hands out the time at which the next message may go, running
+	into debt when the bucket is empty, so a whole batch can be scheduled up front.
+	"""
+
+	def __init__(self, rate, capacity, tokens=None, updated=0.0):
+		self.rate = rate
+		self.capacity = capacity
+		self.tokens = capacity if tokens is None else tokens
+		self.updated = updated
+
+	def reserve(self, now):
+		"""Take one token and return the earliest time, at or after `now`, it may be used."""
+		now = max(now, self.updated)
+		self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+		self.tokens -= 1
+		if self.tokens >= 0:
+			return now
+		return now + -self.tokens / self.rate
+
+
+def get_send_times(count, email_account=None, now=None):
+	"""Return a `send_after` datetime for each of `count` messages, or None when delivery is unthrottled.
+
+	Sends are paced to the messages-per-minute limit of Compliance Plus Settings and, when a delivery
+	window is set, spread evenly across it. The bucket is kept per Email Account, so consecutive runs
+	through the same account share one limit.
+	"""
+	messages_per_minute = frappe.db.get_single_value("Compliance Plus Settings", "messages_per_minute")
+	window_minutes = frappe.db.get_single_value("Compliance Plus Settings", "delivery_window")
+	if not count or not (messages_per_minute or window_minutes):
+		return [None] * count
+
+	rates = []
+	if messages_per_minute:
+		rates.append(messages_per_minute / 60)
+	if window_minutes:
+		rates.append(count / (window_minutes * 60))
+	rate = min(rates)
+	# spreading across a window means no initial burst
+	capacity = 1 if window_minutes else messages_per_minute
+
+	now = now or now_datetime()
+	start = now.timestamp()
+	cache = frappe.cache()
+	# chunks starting together must not reserve the same slots
+	with cache.lock(cache.make_key(f"{BUCKET_KEY}:{email_account or ''}"), timeout=30, blocking_timeout=30):
+		state = cache.hget(BUCKET_KEY, email_account or "") or {}
+		bucket = TokenBucket(rate, capacity, state.get("tokens"), state.get("updated", start))
+		send_times = [add_to_date(now, seconds=bucket.reserve(start) - start) for _i in range(count)]
+		cache.hset(BUCKET_KEY, email_account or "", {"tokens": bucket.tokens, "updated": bucket.updated})
+
+	if window_minutes and send_times[-1] > add_to_date(now, minutes=window_minutes):
+		logger.warning(
+			f"{count} reminder emails need until {send_times[-1]} at {messages_per_minute} per minute, "
+			f"past the {window_minutes} minute delivery window"
+		)
+	return send_times
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import smtplib
+import time
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid, parseaddr
+
+import frappe
+from frappe.email.doctype.email_account.email_account import EmailAccount
+from frappe.utils import cint
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryPipeline:
+	"""Render messages and send them over a pool of SMTP connections.
+
+	Rendering stays on the calling thread, so templates may use the job's database connection,
+	and rendered messages wait in a bounded queue: rendering never runs more than `queue_size`
+	messages ahead of delivery. Each of the `connections` senders owns one connection from
+	`connect` and retries a message up to `max_retries` times on temporary failures, backing
+	off from `retry_delay` seconds. smtplib is blocking, so every SMTP call runs in a thread
+	while the event loop only coordinates.
+	"""
+
+	def __init__(
+		self, connect, connections=4, queue_size=200, max_retries=3, retry_delay=1.0, sent_batch_size=50
+	):
+		self.connect = connect
+		self.connections = max(cint(connections), 1)
+		self.queue_size = max(cint(queue_size), 1)
+		self.max_retries = cint(max_retries)
+		self.retry_delay = retry_delay
+		self.sent_batch_size = max(cint(sent_batch_size), 1)
+
+	def run(self, items, render, delays=None, on_sent=None):
+		"""Deliver one email per item, `render(item)` building its email `Message`.
+
+		`delays` holds, per item, how many seconds after the run starts it may be sent at the
+		earliest, e.g. from `delivery.get_send_times`. `on_sent(deliveries)` is called on the
+		calling thread with every `sent_batch_size` sent deliveries and with the rest at the
+		end, so they can be recorded while the run goes on. Returns one delivery per item, in
+		order, with `item`, `status` ("Sent" or "Failed"), `attempts` and the last `error`.
+		"""
+		return asyncio.run(self.deliver(items, render, delays, on_sent))
+
+	async def deliver(self, items, render, delays=None, on_sent=None):
+		outbox = asyncio.Queue()
+		# one slot per message that is queued or sending
+		slots = asyncio.Semaphore(self.queue_size)
+		start = time.monotonic()
+		deliveries, sent = [], []
+
+		def record(delivery):
+			if not on_sent:
+				return
+			sent.append(delivery)
+			if len(sent) >= self.sent_batch_size:
+				on_sent(sent[:])
+				sent.clear()
+
+		senders = [
+			asyncio.create_task(self.send_worker(outbox, slots, record)) for _i in range(self.connections)
+		]
+		try:
+			for idx, item in enumerate(items):
+				delivery = frappe._dict(item=item, message=None, status="Queued", attempts=0, error=None)
+				delivery.send_at = start + ((delays[idx] or 0) if delays else 0)
+				deliveries.append(delivery)
+				await slots.acquire()
+				try:
+					delivery.message = render(item)
+				except Exception as e:
+					delivery.update(status="Failed", error=f"Render failed: {e}")
+					slots.release()
+					continue
+				outbox.put_nowait(delivery)
+				# rendering does not await, let the senders pick up finished sends in between
+				await asyncio.sleep(0)
+			await outbox.join()
+		finally:
+			for sender in senders:
+				sender.cancel()
+			await asyncio.gather(*senders, return_exceptions=True)
+			if sent:
+				on_sent(sent[:])
+
+		return deliveries
+
+	async def send_worker(self, outbox, slots, record):
+		connection = None
+		try:
+			while True:
+				delivery = await outbox.get()
+				try:
+					connection = await self.send(delivery, connection)
+					if delivery.status == "Sent":
+						record(delivery)
+				finally:
+					# the message is no longer needed, free its slot
+					delivery.message = None
+					slots.release()
+					outbox.task_done()
+		finally:
+			await self.close(connection)
+
+	async def send(self, delivery, connection):
+		"""Send one message, retrying temporary failures. Returns the connection to keep using."""
+		while True:
+			delivery.attempts += 1
+			try:
+				if connection is None:
+					connection = await asyncio.to_thread(self.connect)
+				await self.wait_until(delivery.send_at)
+				await asyncio.to_thread(connection.send_message, delivery.message)
+				delivery.update(status="Sent", error=None)
+				return connection
+			except Exception as e:
+				delivery.error = str(e) or e.__class__.__name__
+				if not isinstance(e, smtplib.SMTPResponseException | smtplib.SMTPRecipientsRefused):
+					# the connection itself failed, reconnect for the next attempt
+					connection = await self.close(connection)
+				if is_permanent(e) or delivery.attempts > self.max_retries:
+					delivery.status = "Failed"
+					return connection
+				await asyncio.sleep(self.retry_delay * 2 ** (delivery.attempts - 1))
+
+	async def wait_until(self, send_at):
+		delay = send_at - time.monotonic()
+		if delay > 0:
+			await asyncio.sleep(delay)
+
+	async def close(self, connection):
+		if connection is not None:
+			try:
+				await asyncio.to_thread(connection.quit)
+			except Exception:
+				pass
+
+
+def is_permanent(error):
+	"""5xx replies will not succeed on a retry."""
+	if isinstance(error, smtplib.SMTPRecipientsRefused):
+		return all(code >= 500 for code, _message in error.recipients.values())
+	return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def get_smtp_connector(email_account=None, sender=None, timeout=30):
+	"""Return a function that opens a new, logged in SMTP connection to the outgoing Email Account.
+
+	The account is read here, so the returned function does not need the database.
+	"""
+	if email_account:
+		account = frappe.get_doc("Email Account", email_account)
+	else:
+		account = EmailAccount.find_outgoing(match_by_email=parseaddr(sender or "")[1], _raise_error=True)
+
+	server = account.smtp_server
+	port = cint(account.smtp_port) or None
+	use_ssl = cint(account.use_ssl_for_outgoing)
+	use_tls = cint(account.use_tls)
+	login = account.login_id if account.get("login_id_is_different") else account.email_id
+	password = None if account.get("no_smtp_authentication") else account.get_password(raise_exception=False)
+
+	def connect():
+		connection = (smtplib.SMTP_SSL if use_ssl else smtplib.SMTP)(server, port or 0, timeout=timeout)
+		if use_tls and not use_ssl:
+			connection.starttls()
+		if password:
+			connection.login(login, password)
+		return connection
+
+	return connect
+
+
+def build_email(sender, recipient, subject, html):
+	# the compat32 MIME classes build messages several times faster than EmailMessage
+	message = MIMEText(html, "html", "utf-8")
+	message["From"] = sender
+	message["To"] = recipient
+	message["Subject"] = subject
+	message["Date"] = formatdate(localtime=True)
+	message["Message-Id"] = make_msgid(domain=parseaddr(sender)[1].rsplit("@", 1)[-1] or None)
+	return message
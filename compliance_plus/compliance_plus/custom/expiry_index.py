@@ -0,0 +1,343 @@
+import datetime
+import hashlib
+import json
+import logging
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, getdate, now_datetime
+from werkzeug.wrappers import Response
+
+from compliance_plus.compliance_plus.custom.bulk_mail import bulk_insert, get_standard_fields
+
+logger = logging.getLogger(__name__)
+
+INDEX_DOCTYPE = "Compliance Expiry Index"
+INDEX_COLUMNS = (
+	"name, creation, modified, owner, modified_by, docstatus, idx, "
+	"source_doctype, source_name, title, kind, due_date, status, in_charge, customer"
+)
+
+# tracker doctype -> [(date field, kind)] it contributes to the index
+TRACKER_SOURCES = {
+	"Licence Tracker": [("expiry_date", "Expiry")],
+	"Compliance Tracker": [("expiry_date", "Expiry")],
+	"Insurance Tracker": [("expiry_date", "Expiry")],
+	"Hearing Tracker": [("expiry_date", "Expiry")],
+	"Subscription Tracker": [("end_date", "End Date")],
+	"Trademark Tracker": [("expiry_date", "Expiry"), ("activity_deadline", "Activity Deadline")],
+}
+
+# Customer licence child table -> kind
+LICENSE_SOURCES = {
+	"Drug License Details": "Drug License",
+	"FSSAI Details": "FSSAI",
+}
+
+# changes whenever the index does, so an unchanged poll of the due items API is one cache read
+VERSION_KEY = "compliance_expiry_index_version"
+DUE_ITEMS_DAYS = 30
+PAGE_LENGTH = 100
+MAX_PAGE_LENGTH = 500
+
+
+def get_entry_name(source_doctype, source_name, kind):
+	"""Stable name per source and kind; the bulk rebuild computes the same md5 in SQL."""
+	return hashlib.md5(f"{source_doctype}|{source_name}|{kind}".encode()).hexdigest()
+
+
+def sync_tracker(doc, method=None):
+	"""Refresh the index entries of one tracker. Hooked to tracker on_update."""
+	entries = []
+	for date_field, kind in TRACKER_SOURCES[doc.doctype]:
+		if not doc.get(date_field):
+			continue
+		entries.append(
+			dict(
+				get_standard_fields(),
+				name=get_entry_name(doc.doctype, doc.name, kind),
+				source_doctype=doc.doctype,
+				source_name=doc.name,
+				title=doc.document_name,
+				kind=kind,
+				due_date=doc.get(date_field),
+				status=doc.status,
+				in_charge=doc.in_charge,
+			)
+		)
+
+	frappe.db.delete(INDEX_DOCTYPE, {"source_doctype": doc.doctype, "source_name": doc.name})
+	bulk_insert(INDEX_DOCTYPE, entries)
+	bump_index_version()
+
+
+def remove_tracker(doc, method=None):
+	frappe.db.delete(INDEX_DOCTYPE, {"source_doctype": doc.doctype, "source_name": doc.name})
+	bump_index_version()
+
+
+def rename_tracker(doc, method=None, old=None, new=None, merge=False):
+	frappe.db.delete(INDEX_DOCTYPE, {"source_doctype": doc.doctype, "source_name": old})
+	sync_tracker(frappe.get_doc(doc.doctype, new))
+
+
+def sync_customer_licenses(doc, method=None):
+	"""Refresh the Drug License / FSSAI entries of one customer. Hooked to Customer on_update."""
+	entries = []
+	for df in doc.meta.get_table_fields():
+		kind = LICENSE_SOURCES.get(df.options)
+		if not kind:
+			continue
+		for row in doc.get(df.fieldname):
+			if not row.expiry_date:
+				continue
+			entries.append(
+				dict(
+					get_standard_fields(),
+					name=get_entry_name(df.options, row.name, kind),
+					source_doctype=df.options,
+					source_name=row.name,
+					title=row.license_number,
+					kind=kind,
+					due_date=row.expiry_date,
+					customer=doc.name,
+				)
+			)
+
+	remove_customer_licenses(doc)
+	bulk_insert(INDEX_DOCTYPE, entries)
+
+
+def remove_customer_licenses(doc, method=None):
+	frappe.db.delete(INDEX_DOCTYPE, {"customer": doc.name, "source_doctype": ["in", list(LICENSE_SOURCES)]})
+	bump_index_version()
+
+
+def rename_customer(doc, method=None, old=None, new=None, merge=False):
+	frappe.db.delete(INDEX_DOCTYPE, {"customer": old, "source_doctype": ["in", list(LICENSE_SOURCES)]})
+	sync_customer_licenses(frappe.get_doc("Customer", new))
+
+
+def rebuild_expiry_index():
+	"""Rebuild the whole index with one INSERT ... SELECT per source."""
+	values = {"now": now_datetime(), "user": frappe.session.user}
+
+	frappe.db.delete(INDEX_DOCTYPE)
+	for doctype in TRACKER_SOURCES:
+		index_trackers(doctype)
+
+	for doctype, kind in LICENSE_SOURCES.items():
+		if not frappe.db.table_exists(doctype):
+			continue
+		frappe.db.sql(
+			f"""
+			insert into `tab{INDEX_DOCTYPE}` ({INDEX_COLUMNS})
+			select md5(concat_ws('|', %(doctype)s, name, %(kind)s)), %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+				%(doctype)s, name, license_number, %(kind)s, expiry_date, null, null, parent
+			from `tab{doctype}`
+			where parenttype = 'Customer' and expiry_date is not null
+			""",
+			dict(values, doctype=doctype, kind=kind),
+		)
+
+	from compliance_plus.compliance_plus.custom.dashboard import clear_dashboard_cache
+
+	clear_dashboard_cache()
+	bump_index_version()
+	logger.info(f"Compliance Expiry Index rebuilt: {frappe.db.count(INDEX_DOCTYPE)} entries")
+
+
+def index_trackers(doctype, names=None):
+	"""Add index entries for the trackers of `doctype` with one INSERT ... SELECT per date field.
+
+	Pass `names` to only index those trackers, e.g. after a bulk import that skipped doc_events.
+	"""
+	values = {"now": now_datetime(), "user": frappe.session.user, "doctype": doctype, "names": names}
+	condition = "and name in %(names)s" if names else ""
+
+	for date_field, kind in TRACKER_SOURCES[doctype]:
+		frappe.db.sql(
+			f"""
+			insert into `tab{INDEX_DOCTYPE}` ({INDEX_COLUMNS})
+			select md5(concat_ws('|', %(doctype)s, name, %(kind)s)), %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+				%(doctype)s, name, document_name, %(kind)s, `{date_field}`, status, in_charge, null
+			from `tab{doctype}`
+			where `{date_field}` is not null {condition}
+			""",
+			dict(values, kind=kind),
+		)
+	bump_index_version()
+
+
+def refresh_tracker_statuses():
+	"""Copy tracker statuses into the index after set-based status updates, which skip doc_events."""
+	for doctype in TRACKER_SOURCES:
+		frappe.db.sql(
+			f"""
+			update `tab{INDEX_DOCTYPE}` entry
+			inner join `tab{doctype}` tracker on tracker.name = entry.source_name
+			set entry.status = tracker.status
+			where entry.source_doctype = %(doctype)s
+				and entry.status != tracker.status
+			""",
+			{"doctype": doctype},
+		)
+	bump_index_version()
+
+
+def get_due_entries(from_date, to_date, kinds=None, fields=None, **filters):
+	"""All expiries between two dates, across every tracker and customer licence, from one table."""
+	filters["due_date"] = ["between", [from_date, to_date]]
+	if kinds:
+		filters["kind"] = ["in", kinds]
+	return frappe.get_all(
+		INDEX_DOCTYPE,
+		filters=filters,
+		fields=fields
+		or ["source_doctype", "source_name", "title", "kind", "due_date", "status", "in_charge", "customer"],
+		order_by="due_date asc",
+	)
+
+
+def bump_index_version():
+	"""Start a new index version once the current transaction commits.
+
+	Bumping before the commit would let a concurrent poll pair the new version with old rows.
+	"""
+	frappe.db.after_commit.add(lambda: frappe.cache().delete_value(VERSION_KEY))
+
+
+def get_index_version():
+	version = frappe.cache().get_value(VERSION_KEY)
+	if not version:
+		version = frappe.generate_hash(length=12)
+		frappe.cache().set_value(VERSION_KEY, version)
+	return version
+
+
+@frappe.whitelist(methods=["GET"])
+def get_due_items(
+	from_date=None,
+	to_date=None,
+	doctype=None,
+	status=None,
+	in_charge=None,
+	cursor=None,
+	page_length=PAGE_LENGTH,
+):
+	"""Due items across every tracker and customer licence, one keyset page at a time.
+
+	`doctype` and `status` take a value or a JSON list. Pass the returned `next_cursor` back as
+	`cursor` for the next page. Responses carry an ETag; a request whose If-None-Match still
+	matches gets an empty 304 without touching the database.
+	"""
+	filters = frappe._dict(
+		from_date=str(getdate(from_date)),
+		to_date=str(getdate(to_date) if to_date else add_days(getdate(from_date), DUE_ITEMS_DAYS)),
+		doctypes=sorted(get_readable_sources(parse_list(doctype))),
+		statuses=sorted(parse_list(status)),
+		in_charge=in_charge,
+		cursor=validate_cursor(cursor),
+		page_length=min(cint(page_length) or PAGE_LENGTH, MAX_PAGE_LENGTH),
+	)
+	etag = get_due_items_etag(filters)
+	headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"}
+
+	if frappe.request and frappe.request.if_none_match.contains_weak(etag):
+		return Response(status=304, headers=headers)
+
+	return Response(
+		frappe.as_json({"message": get_due_page(filters)}),
+		mimetype="application/json",
+		headers=headers,
+	)
+
+
+def parse_list(value):
+	if not value:
+		return []
+	if isinstance(value, str):
+		return json.loads(value) if value.startswith("[") else [value]
+	return list(value)
+
+
+def validate_cursor(cursor):
+	"""A cursor is the `due_date|name` of the last item of the previous page."""
+	if not cursor:
+		return None
+	due_date, _sep, name = cursor.partition("|")
+	try:
+		datetime.date.fromisoformat(due_date)
+	except ValueError:
+		name = None
+	if not name:
+		frappe.throw(_("Invalid cursor {0}").format(frappe.bold(cursor)), frappe.ValidationError)
+	return cursor
+
+
+def get_readable_sources(doctypes=None):
+	"""The index sources, limited to `doctypes`, that the user may read; licences need Customer read."""
+	sources = [*TRACKER_SOURCES, *LICENSE_SOURCES]
+	return [
+		source
+		for source in sources
+		if (not doctypes or source in doctypes)
+		and frappe.has_permission("Customer" if source in LICENSE_SOURCES else source, "read")
+	]
+
+
+def get_permission_condition(source):
+	"""Restrict `source` entries to the documents the user may read, as `frappe.get_list` would.
+
+	Licence entries follow their Customer. User Permissions, `if_owner` and permission query
+	conditions all end up in the `get_list` subquery.
+	"""
+	doctype, field = ("Customer", "customer") if source in LICENSE_SOURCES else (source, "source_name")
+	readable = frappe.get_list(doctype, fields=["name"], run=False)
+	# the subquery is already rendered, keep its literals out of the outer query's placeholders
+	readable = readable.replace("%", "%%")
+	return f"(source_doctype = {frappe.db.escape(source)} and {field} in ({readable}))"
+
+
+def get_due_items_etag(filters):
+	"""Same index version, user and filters means the same response."""
+	key = f"{get_index_version()}|{frappe.session.user}|{frappe.as_json(filters)}"
+	return hashlib.md5(key.encode()).hexdigest()
+
+
+def get_due_page(filters):
+	"""One page of index entries ordered by (due_date, name), resuming after `filters.cursor`."""
+	if not filters.doctypes:
+		return frappe._dict(items=[], next_cursor=None)
+
+	sources = " or ".join(get_permission_condition(source) for source in filters.doctypes)
+	conditions = ["due_date between %(from_date)s and %(to_date)s", f"({sources})"]
+	values = dict(filters, statuses=tuple(filters.statuses))
+	if filters.statuses:
+		conditions.append("status in %(statuses)s")
+	if filters.in_charge:
+		conditions.append("in_charge = %(in_charge)s")
+	if filters.cursor:
+		values["after_date"], values["after_name"] = filters.cursor.split("|", 1)
+		conditions.append(
+			"(due_date > %(after_date)s or (due_date = %(after_date)s and name > %(after_name)s))"
+		)
+
+	items = frappe.db.sql(
+		f"""
+		select name, source_doctype, source_name, title, kind, due_date, status, in_charge, customer
+		from `tab{INDEX_DOCTYPE}`
+		where {" and ".join(conditions)}
+		order by due_date, name
+		limit %(page_length)s
+		""",
+		values,
+		as_dict=True,
+	)
+
+	next_cursor = None
+	if len(items) == filters.page_length:
+		next_cursor = f"{items[-1].due_date}|{items[-1].name}"
+	for item in items:
+		del item["name"]
+	return frappe._dict(items=items, next_cursor=next_cursor)
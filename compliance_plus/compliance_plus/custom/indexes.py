@@ -0,0 +1,102 @@
+import logging
+import re
+from datetime import datetime, timedelta
+
+import frappe
+
+from compliance_plus.compliance_plus.custom.tracker_reminders import REMINDER_TRACKERS
+
+logger = logging.getLogger(__name__)
+
+LICENSE_DOCTYPES = ("Drug License Details", "FSSAI Details")
+
+
+def get_indexes():
+	"""Return (doctype, fields, index_name) for every composite index the app relies on."""
+	indexes = []
+	for doctype in LICENSE_DOCTYPES:
+		# report: licences of one customer; cron: expiry range across customers
+		indexes.append((doctype, ["parent", "expiry_date"], "parent_expiry_date_index"))
+		indexes.append((doctype, ["expiry_date", "parent"], "expiry_date_parent_index"))
+
+	for doctype, date_fields in REMINDER_TRACKERS.items():
+		for date_field, _kind in date_fields:
+			indexes.append((doctype, ["status", date_field], f"status_{date_field}_index"))
+			indexes.append((doctype, ["in_charge", date_field], f"in_charge_{date_field}_index"))
+			indexes.append((doctype, ["enable_reminder", date_field], f"enable_reminder_{date_field}_index"))
+
+	indexes.append(("Compliance Expiry Index", ["source_doctype", "source_name"], "source_index"))
+	indexes.append(("Compliance Expiry Index", ["kind", "due_date"], "kind_due_date_index"))
+	indexes.append(("Compliance Expiry Index", ["in_charge", "due_date"], "in_charge_due_date_index"))
+	indexes.append(("Compliance Expiry Index", ["customer", "due_date"], "customer_due_date_index"))
+
+	# cron: licences reminded in the run's expiry range; chunks: one slice of customers
+	indexes.append(("Reminder Ledger", ["expiry_date", "last_sent_on"], "expiry_date_last_sent_on_index"))
+	indexes.append(("Reminder Ledger", ["customer", "last_sent_on"], "customer_last_sent_on_index"))
+
+	indexes.append(
+		(
+			"Communication",
+			["reference_doctype", "reference_name", "communication_type", "creation"],
+			"reference_communication_type_creation_index",
+		)
+	)
+	return indexes
+
+
+def add_indexes():
+	for doctype, fields, index_name in get_indexes():
+		if not frappe.db.table_exists(doctype):
+			logger.info(f"Skipped index {index_name}: {doctype} does not exist")
+			continue
+		frappe.db.add_index(doctype, fields, index_name)
+
+
+def explain_hot_queries():
+	"""Return EXPLAIN plans for the cron, tracker reminder and report queries.
+
+	The queries are recorded by running the real code paths, so the plans always match
+	what runs in production. The DocType of any step that reads a whole table is listed
+	under `full_scans`.
+
+		bench --site <site> execute compliance_plus.compliance_plus.custom.indexes.explain_hot_queries
+	"""
+	from unittest.mock import patch
+
+	from compliance_plus.compliance_plus.custom.license_tracker_cron import get_reminder_plan
+	from compliance_plus.compliance_plus.custom.tracker_reminders import get_due_trackers
+	from compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report import (
+		get_license_rows,
+	)
+
+	today = datetime.today().date()
+	queries = []
+	sql = frappe.db.sql
+
+	def record(query, values=(), *args, **kwargs):
+		if str(query).lstrip().lower().startswith("select"):
+			queries.append((str(query), values))
+		return sql(query, values, *args, **kwargs)
+
+	with patch.object(frappe.db, "sql", side_effect=record):
+		get_reminder_plan(today, today + timedelta(days=30), 15)
+		get_due_trackers(today)
+		get_license_rows(frappe._dict(expiry_in_30_days=1), today, today + timedelta(days=30))
+
+	plans = []
+	for query, values in queries:
+		plan = frappe.db.sql(f"explain {query}", values, as_dict=True)
+		# EXPLAIN names tables by their alias, report the DocType instead
+		doctypes = {alias: doctype for doctype, alias in re.findall(r"`tab([^`]+)`\s+(?:as\s+)?(\w+)", query)}
+		plans.append(
+			{
+				"query": " ".join(query.split()),
+				"plan": plan,
+				"full_scans": [
+					doctypes.get(row.table) or row.table.removeprefix("tab")
+					for row in plan
+					if row.type == "ALL"
+				],
+			}
+		)
+	return plans
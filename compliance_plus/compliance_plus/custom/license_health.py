@@ -0,0 +1,150 @@
+import json
+import logging
+
+import frappe
+from frappe.utils import add_days, getdate
+
+logger = logging.getLogger(__name__)
+
+# customer -> JSON health summary, in one Redis hash
+HEALTH_KEY = "compliance_plus_license_health"
+LICENSE_DOCTYPES = ("Drug License Details", "FSSAI Details")
+# same window as the License Tracker Report's "expiring in 30 days"
+EXPIRING_DAYS = 30
+MAX_CUSTOMERS = 500
+WRITE_BATCH = 1000
+
+
+def compute_health(customers=None, today=None):
+	"""Health of every customer with licences, or of `customers`, from one GROUP BY over both tables."""
+	today = today or getdate()
+	values = {"today": today, "expiring_by": add_days(today, EXPIRING_DAYS), "customers": customers}
+	condition = "and parent in %(customers)s" if customers else ""
+	licenses = " union all ".join(
+		f"""
+		select parent, expiry_date from `tab{doctype}`
+		where parenttype = 'Customer' and expiry_date is not null {condition}
+		"""
+		for doctype in LICENSE_DOCTYPES
+	)
+
+	rows = frappe.db.sql(
+		f"""
+		select parent as customer,
+			sum(expiry_date < %(today)s) as expired,
+			sum(expiry_date between %(today)s and %(expiring_by)s) as expiring,
+			min(case when expiry_date >= %(today)s then expiry_date end) as next_expiry
+		from ({licenses}) licenses
+		group by parent
+		""",
+		values,
+		as_dict=True,
+	)
+
+	health = {row.customer: get_health(row, today) for row in rows}
+	for customer in customers or ():
+		# customers without licences are cached too, so list views do not keep missing them
+		health.setdefault(customer, get_health(frappe._dict(), today))
+	return health
+
+
+def get_health(row, today):
+	"""The worst state of a customer's licences, its next expiry and how many expire soon."""
+	if row.expired:
+		state = "Expired"
+	elif row.expiring:
+		state = "Expiring Soon"
+	elif row.next_expiry:
+		state = "Valid"
+	else:
+		state = None
+
+	return {
+		"state": state,
+		"next_expiry": str(row.next_expiry) if row.next_expiry else None,
+		"expiring_count": int(row.expiring or 0),
+		"as_of": str(today),
+	}
+
+
+def store_health(health, replace=False):
+	"""Write health summaries to the cache hash; `replace` drops every other entry first.
+
+	The hash is written and read through a raw pipeline, so a whole batch is one round trip.
+	"""
+	cache = frappe.cache()
+	key = cache.make_key(HEALTH_KEY)
+	pipeline = cache.pipeline()
+	if replace:
+		pipeline.delete(key)
+
+	items = [(customer, json.dumps(summary)) for customer, summary in health.items()]
+	for start in range(0, len(items), WRITE_BATCH):
+		pipeline.hset(key, mapping=dict(items[start : start + WRITE_BATCH]))
+	pipeline.execute()
+
+
+def remove_health(customers):
+	if customers:
+		cache = frappe.cache()
+		cache.pipeline().hdel(cache.make_key(HEALTH_KEY), *customers).execute()
+
+
+def get_cached_health(customers, today=None):
+	"""Health of `customers` from the cache, recomputing only the missing and stale entries."""
+	if not customers:
+		return {}
+
+	today = str(today or getdate())
+	cache = frappe.cache()
+	cached = cache.pipeline().hmget(cache.make_key(HEALTH_KEY), customers).execute()[0]
+
+	health, misses = {}, []
+	for customer, value in zip(customers, cached, strict=True):
+		summary = json.loads(value) if value else None
+		# states move with the date, so yesterday's entry is stale even if nothing changed
+		if summary and summary["as_of"] == today:
+			health[customer] = summary
+		else:
+			misses.append(customer)
+
+	if misses:
+		fresh = compute_health(misses, getdate(today))
+		store_health(fresh)
+		health.update(fresh)
+	return health
+
+
+def refresh_health(customers):
+	"""Recompute and cache the health of `customers`; a rollback drops the entries again."""
+	store_health(compute_health(customers))
+	frappe.db.after_rollback.add(lambda: remove_health(customers))
+
+
+@frappe.whitelist()
+def get_license_health(customers):
+	"""Licence health of up to MAX_CUSTOMERS customers, for the Customer form and list."""
+	customers = json.loads(customers) if isinstance(customers, str) else customers
+	customers = frappe.get_list("Customer", filters={"name": ["in", customers[:MAX_CUSTOMERS]]}, pluck="name")
+	return get_cached_health(customers)
+
+
+def rebuild_license_health():
+	"""Recompute every customer's licence health. Runs daily, as states change with the date."""
+	health = compute_health()
+	store_health(health, replace=True)
+	logger.info(f"Licence health cached for {len(health)} customers")
+
+
+def refresh_customer_health(doc, method=None):
+	"""Hooked to Customer on_update."""
+	refresh_health([doc.name])
+
+
+def remove_customer_health(doc, method=None):
+	remove_health([doc.name])
+
+
+def rename_customer_health(doc, method=None, old=None, new=None, merge=False):
+	remove_health([old])
+	refresh_health([new])
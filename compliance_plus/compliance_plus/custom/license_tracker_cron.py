@@ -1,120 +1,666 @@
-import frappe
-from datetime import datetime, timedelta
+import hashlib
 import logging
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import add_to_date, get_datetime, getdate, now_datetime, time_diff_in_seconds
+
+from compliance_plus.compliance_plus.custom.bulk_mail import insert_communications, queue_emails
+from compliance_plus.compliance_plus.custom.delivery import get_send_times
+from compliance_plus.compliance_plus.custom.delivery_pipeline import (
+	DeliveryPipeline,
+	build_email,
+	get_smtp_connector,
+)
+from compliance_plus.compliance_plus.custom.profiling import QueryCounter, timer
 
 logger = logging.getLogger(__name__)
 
+# a run whose chunks have not all reported back by then has lost a worker
+STALE_RUN_HOURS = 6
+# seconds a chunk job may run on the long queue
+CHUNK_TIMEOUT = 1500
+# an SMTP pipeline chunk only waits this many seconds for a send slot, later slots go to the
+# Email Queue with their send_after, so neither a chunk nor the inline scheduler job times out
+MAX_PIPELINE_WAIT = 120
 
-def already_sent_recently(customer, interval_days):
-	threshold_date = datetime.today() - timedelta(days=interval_days)
-	return frappe.db.exists(
-		"Communication",
-		{
-			"reference_doctype": "Customer",
-			"reference_name": customer,
-			"communication_type": "Automated Message",
-			"creation": [">", threshold_date.strftime("%Y-%m-%d")],
-		},
+# Email Template name -> (modified, compiled jinja template), kept for the life of the worker
+_compiled_templates = {}
+
+
+def get_compiled_template(template):
+	"""Compile an Email Template body once and reuse it until the template is modified."""
+	cached = _compiled_templates.get(template.name)
+	if cached and cached[0] == template.modified:
+		return cached[1]
+
+	if ".__" in template.response:
+		frappe.throw(frappe._("Illegal template"))
+
+	compiled = frappe.get_jenv().from_string(template.response)
+	_compiled_templates[template.name] = (template.modified, compiled)
+	return compiled
+
+
+def evict_compiled_template(doc, method=None):
+	_compiled_templates.pop(doc.name, None)
+
+
+def get_expiring_licenses(doctype, from_date, to_date, customers=None):
+	"""Return expiring licence rows of enabled customers, grouped by customer.
+
+	Pass `customers` to only look at those customers.
+	"""
+	if customers is not None and not customers:
+		return {}
+
+	child = frappe.qb.DocType(doctype)
+	customer = frappe.qb.DocType("Customer")
+
+	query = (
+		frappe.qb.from_(child)
+		.inner_join(customer)
+		.on(customer.name == child.parent)
+		.select(child.parent, child.license_number, child.expiry_date)
+		.where(customer.disabled == 0)
+		.where(child.expiry_date.between(from_date, to_date))
+		.orderby(child.modified, order=frappe.qb.desc)
 	)
+	if customers is not None:
+		query = query.where(child.parent.isin(list(customers)))
+	rows = query.run(as_dict=True)
 
+	licenses = {}
+	for row in rows:
+		licenses.setdefault(row.pop("parent"), []).append(row)
+	return licenses
 
-def log_communication(customer, subject):
-	frappe.get_doc(
-		{
-			"doctype": "Communication",
-			"communication_type": "Automated Message",
-			"subject": subject,
-			"reference_doctype": "Customer",
-			"reference_name": customer,
-			"content": subject,
-			"sent_or_received": "Sent",
-		}
-	).insert(ignore_permissions=True)
 
-def send_license_expiry_reminders():
-	settings = frappe.get_single("Compliance Plus Settings")
-	expiry_threshold = settings.expiry_threshold or 15
-	set_interval = settings.set_interval or 15
-	sender = settings.sender
-	template_name = settings.email_template
-
-	if not sender or not template_name:
-		frappe.log_error("Sender or Email Template not configured.", "License Expiry Configuration Error")
-		logger.error("Sender or Email Template not configured in Compliance Plus Settings")
-		return
+def get_ledger_name(customer, license_type, license_number, expiry_date):
+	"""Stable Reminder Ledger name per licence and expiry, so re-sends update the same entry."""
+	return hashlib.md5(f"{customer}|{license_type}|{license_number}|{expiry_date}".encode()).hexdigest()
 
-	try:
-		template = frappe.get_doc("Email Template", template_name)
-	except Exception as e:
-		frappe.log_error("Invalid Email Template", frappe.get_traceback())
-		logger.error(f"Failed to load Email Template '{template_name}': {str(e)}")
+
+def get_reminded_licenses(interval_days, customers=None, from_date=None, to_date=None):
+	"""Load every licence reminded within `interval_days` as one set of ledger keys.
+
+	Keys are (customer, license type, license number, expiry date), so a licence that enters
+	the window or is renewed with a new expiry date is never suppressed by an older reminder.
+	"""
+	threshold_date = datetime.today().date() - timedelta(days=interval_days)
+	filters = {"last_sent_on": [">", threshold_date]}
+	if customers is not None:
+		filters["customer"] = ["in", list(customers) or [""]]
+	if from_date and to_date:
+		filters["expiry_date"] = ["between", [from_date, to_date]]
+
+	return set(
+		map(
+			tuple,
+			frappe.get_all(
+				"Reminder Ledger",
+				filters=filters,
+				fields=["customer", "license_type", "license_number", "expiry_date"],
+				as_list=True,
+			),
+		)
+	)
+
+
+def get_due_licenses(customer, license_type, licenses, reminded):
+	return [
+		row
+		for row in licenses
+		if (customer, license_type, row.license_number, row.expiry_date) not in reminded
+	]
+
+
+def set_due_licenses(customer, dl_licenses, fssai_licenses, reminded):
+	"""Keep only the customer's licences not yet reminded in this interval; False when none are left."""
+	customer.dl_details = get_due_licenses(customer.name, "Drug License", dl_licenses, reminded)
+	customer.fssai_details = get_due_licenses(customer.name, "FSSAI", fssai_licenses, reminded)
+	return bool(customer.dl_details or customer.fssai_details)
+
+
+def record_reminders(messages, sent_on=None):
+	"""Upsert a Reminder Ledger entry for every licence of the queued reminders in one statement."""
+	sent_on = sent_on or datetime.today().date()
+	now = now_datetime()
+	rows = [
+		(
+			get_ledger_name(message.reference_name, license_type, license_number, expiry_date),
+			now,
+			now,
+			frappe.session.user,
+			frappe.session.user,
+			message.reference_name,
+			license_type,
+			license_number,
+			expiry_date,
+			sent_on,
+		)
+		for message in messages
+		for license_type, license_number, expiry_date in message.licenses
+	]
+	if not rows:
 		return
 
-	today = datetime.today().date()
-	target_expiry_date = today + timedelta(days=expiry_threshold)
+	frappe.db.sql(
+		f"""
+		insert into `tabReminder Ledger`
+			(name, creation, modified, owner, modified_by, customer, license_type, license_number, expiry_date, last_sent_on)
+		values {", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows))}
+		on duplicate key update last_sent_on = values(last_sent_on), modified = values(modified)
+		""",
+		[value for row in rows for value in row],
+	)
+
 
-	customers = frappe.get_all(
-		"Customer", filters={"disabled": 0}, fields=["name", "customer_name", "email_id"]
+def get_changed_customers(since, today, target_expiry_date, interval_days):
+	"""Return the customers that may owe a reminder since the `since` watermark.
+
+	These are customers whose licence rows or own record changed after `since`, whose
+	licences entered the expiry window since then, and whose earlier reminders are due
+	to be repeated. Each comes from a plain range query.
+	"""
+	values = {
+		"since": since,
+		"today": today,
+		"target_expiry_date": target_expiry_date,
+		# the window's far end when the watermark was set
+		"entered_after": getdate(since) + (target_expiry_date - today),
+		"resend_before": today - timedelta(days=interval_days),
+	}
+
+	customers = set()
+	for doctype in ("Drug License Details", "FSSAI Details"):
+		customers.update(
+			frappe.db.sql_list(
+				f"""
+				select distinct parent from `tab{doctype}`
+				where parenttype = 'Customer'
+					and expiry_date between %(today)s and %(target_expiry_date)s
+					and (modified > %(since)s or expiry_date > %(entered_after)s)
+				""",
+				values,
+			)
+		)
+	customers.update(frappe.db.sql_list("select name from `tabCustomer` where modified > %(since)s", values))
+	customers.update(
+		frappe.db.sql_list(
+			"""
+			select distinct customer from `tabReminder Ledger`
+			where expiry_date between %(today)s and %(target_expiry_date)s
+				and last_sent_on <= %(resend_before)s
+			""",
+			values,
+		)
 	)
+	return customers
+
+
+def get_reminder_plan(today, target_expiry_date, interval_days, timings=None, since=None):
+	"""Work out the whole send plan from a few bulk queries.
+
+	Returns the list of customers to remind, each carrying its expiring Drug License
+	and FSSAI rows not yet reminded in the interval, and the number of customers
+	skipped per reason. With a `since` watermark only customers changed since then
+	are looked at. Time spent per phase is added to `timings` when given.
+	"""
+	timings = {} if timings is None else timings
 
-	emails_sent = 0
-	customers_skipped = 0
+	with timer(timings, "licence_lookup"):
+		changed = None
+		if since:
+			changed = get_changed_customers(since, today, target_expiry_date, interval_days)
+		dl_licenses = get_expiring_licenses("Drug License Details", today, target_expiry_date, changed)
+		fssai_licenses = get_expiring_licenses("FSSAI Details", today, target_expiry_date, changed)
+	candidates = set(dl_licenses) | set(fssai_licenses)
+
+	with timer(timings, "customer_fetch"):
+		considered = len(changed) if since else frappe.db.count("Customer", {"disabled": 0})
+		skipped = {
+			"no_expiring_licenses": max(considered - len(candidates), 0),
+			"no_email": 0,
+			"recently_sent": 0,
+		}
+		if not candidates:
+			return [], skipped
+
+		customers = frappe.get_all(
+			"Customer",
+			filters={"disabled": 0, "name": ["in", list(candidates)]},
+			fields=["name", "customer_name", "email_id"],
+		)
 
+	with timer(timings, "dedup_check"):
+		reminded = get_reminded_licenses(interval_days, from_date=today, to_date=target_expiry_date)
+
+	plan = []
 	for customer in customers:
 		if not customer.email_id:
 			logger.info(f"Skipped customer {customer.name}: No email ID")
-			customers_skipped += 1
+			skipped["no_email"] += 1
 			continue
 
-		if already_sent_recently(customer.name, set_interval):
+		if not set_due_licenses(
+			customer, dl_licenses.get(customer.name, []), fssai_licenses.get(customer.name, []), reminded
+		):
 			logger.info(f"Skipped customer {customer.name}: Email already sent recently")
-			customers_skipped += 1
+			skipped["recently_sent"] += 1
 			continue
 
-		dl_details = frappe.get_all(
-			"Drug License Details",
-			filters={"parent": customer.name, "expiry_date": ["between", [today, target_expiry_date]]},
-			fields=["license_number", "expiry_date"],
-		)
+		plan.append(customer)
+
+	return plan, skipped
+
+
+def send_license_expiry_reminders():
+	"""Plan the nightly run and fan the send plan out to long-queue workers in chunks.
+
+	Every run is recorded in a Reminder Run Log, which the chunks update as they finish.
+	"""
+	started_at = now_datetime()
+	timings = {}
+
+	with QueryCounter() as queries:
+		with timer(timings, "settings_load"):
+			settings = frappe.get_single("Compliance Plus Settings")
+			expiry_threshold = settings.expiry_threshold or 15
+			set_interval = settings.set_interval or 15
+			chunk_size = settings.reminder_chunk_size or 500
+			sender = settings.sender
+			email_account = settings.sender_id
+			template_name = settings.email_template
 
-		fssai_details = frappe.get_all(
-			"FSSAI Details",
-			filters={"parent": customer.name, "expiry_date": ["between", [today, target_expiry_date]]},
-			fields=["license_number", "expiry_date"],
+			if not sender or not template_name:
+				frappe.log_error(
+					"Sender or Email Template not configured.", "License Expiry Configuration Error"
+				)
+				logger.error("Sender or Email Template not configured in Compliance Plus Settings")
+				return
+
+			if not frappe.db.exists("Email Template", template_name):
+				frappe.log_error("Invalid Email Template", f"Email Template {template_name} not found")
+				logger.error(f"Failed to load Email Template '{template_name}'")
+				return
+
+		today = datetime.today().date()
+		target_expiry_date = today + timedelta(days=expiry_threshold)
+		since = get_incremental_watermark(settings, today)
+
+		plan, skipped = get_reminder_plan(today, target_expiry_date, set_interval, timings, since)
+		logger.info(f"Skipped {skipped['no_expiring_licenses']} customers: No expiring licenses")
+
+		# SMTP pipeline chunks reserve their send times from the same bucket as they start
+		if not settings.smtp_pipeline:
+			with timer(timings, "send_scheduling"):
+				for customer, send_after in zip(plan, get_send_times(len(plan), email_account), strict=True):
+					customer.send_after = send_after
+
+	chunks = [plan[i : i + chunk_size] for i in range(0, len(plan), chunk_size)] or [[]]
+	run_log = start_run(
+		started_at, len(chunks), skipped, timings, queries.count, "Incremental" if since else "Full"
+	)
+
+	job_kwargs = {
+		"run_log": run_log,
+		"sender": sender,
+		"email_account": email_account,
+		"template_name": template_name,
+		"interval_days": set_interval,
+	}
+	if len(chunks) == 1:
+		process_reminder_chunk(customers=chunks[0], **job_kwargs)
+		return
+
+	for idx, chunk in enumerate(chunks):
+		frappe.enqueue(
+			"compliance_plus.compliance_plus.custom.license_tracker_cron.process_reminder_chunk",
+			queue="long",
+			timeout=CHUNK_TIMEOUT,
+			job_id=f"license_expiry_reminders:{run_log}:{idx}",
+			deduplicate=True,
+			now=frappe.flags.in_test,
+			customers=chunk,
+			**job_kwargs,
 		)
 
-		if not dl_details and not fssai_details:
-			logger.info(f"Skipped customer {customer.name}: No expiring licenses")
-			customers_skipped += 1
-			continue
 
-		context = {
-			"doc": {
-				"customer_name": customer.customer_name,
-				"company": frappe.defaults.get_global_default("company"),
-				"fsl_dl_details": dl_details,
-				"fsl_fssai_details": fssai_details,
-			}
-		}
+def get_incremental_watermark(settings, today):
+	"""Return the watermark an incremental run starts from, or None when a full sweep is due."""
+	if not (settings.incremental_reminders and settings.reminder_watermark and settings.last_full_sweep):
+		return None
+	if (today - getdate(settings.last_full_sweep)).days >= (settings.full_sweep_interval or 7):
+		return None
+	return get_datetime(settings.reminder_watermark)
+
+
+def process_reminder_chunk(run_log, customers, sender, template_name, interval_days, email_account=None):
+	"""Send reminders for one slice of the plan and report the counters back to the run."""
+	counters = {"emails_sent": 0, "skipped_recently_sent": 0, "failed_renders": 0, "failed_sends": 0}
+	timings = {}
+	failed = True
 
+	with QueryCounter() as queries:
 		try:
-			message = frappe.render_template(template.response, context)
-		except Exception:
-			frappe.log_error("Template Render Failed", frappe.get_traceback())
-			logger.error(f"Failed to render template for customer {customer.name}")
-			continue
+			template = frappe.get_doc("Email Template", template_name)
+			try:
+				with timer(timings, "rendering"):
+					compiled_template = get_compiled_template(template)
+			except Exception:
+				frappe.log_error("Template Render Failed", frappe.get_traceback())
+				logger.error(f"Failed to compile Email Template '{template_name}'")
+				counters["failed_renders"] = len(customers)
+				return
+
+			# a retried or overlapping job must never email a customer twice
+			with timer(timings, "dedup_check"):
+				reminded = get_reminded_licenses(
+					interval_days, customers=[customer.name for customer in customers]
+				)
+			company = frappe.defaults.get_global_default("company")
+
+			due = []
+			for customer in customers:
+				if not set_due_licenses(customer, customer.dl_details, customer.fssai_details, reminded):
+					logger.info(f"Skipped customer {customer.name}: Email already sent recently")
+					counters["skipped_recently_sent"] += 1
+					continue
+				due.append(customer)
+
+			if frappe.db.get_single_value("Compliance Plus Settings", "smtp_pipeline"):
+				pipelined, due = schedule_pipeline(due, email_account, timings)
+				counters.update(
+					deliver_reminders(
+						pipelined,
+						compiled_template,
+						company,
+						template.subject,
+						sender,
+						timings,
+						email_account,
+					)
+				)
+
+			outgoing = []
+			for customer in due:
+				with timer(timings, "rendering"):
+					message = render_reminder(customer, compiled_template, company)
+				if message is None:
+					counters["failed_renders"] += 1
+					continue
+
+				outgoing.append(
+					get_reminder_record(
+						customer, template.subject, message, send_after=customer.get("send_after")
+					)
+				)
+
+			queued = queue_reminders(outgoing, sender, timings, email_account)
+			counters["emails_sent"] += queued
+			counters["failed_sends"] += len(outgoing) - queued
+			failed = False
+		finally:
+			finish_chunk(run_log, counters, timings, queries.count, failed)
+
+
+def render_reminder(customer, compiled_template, company):
+	try:
+		return compiled_template.render(get_reminder_context(customer, company))
+	except Exception:
+		frappe.log_error("Template Render Failed", frappe.get_traceback())
+		logger.error(f"Failed to render template for customer {customer.name}")
+
 
+def get_reminder_context(customer, company):
+	return {
+		"doc": {
+			"customer_name": customer.customer_name,
+			"company": company,
+			"fsl_dl_details": customer.dl_details,
+			"fsl_fssai_details": customer.fssai_details,
+		}
+	}
+
+
+def get_reminder_record(customer, subject, message=None, **kwargs):
+	"""The outgoing message, with what its Communication and ledger entries need."""
+	return frappe._dict(
+		reference_doctype="Customer",
+		reference_name=customer.name,
+		recipients=[customer.email_id],
+		subject=subject,
+		message=message,
+		licenses=[("Drug License", row.license_number, row.expiry_date) for row in customer.dl_details]
+		+ [("FSSAI", row.license_number, row.expiry_date) for row in customer.fssai_details],
+		**kwargs,
+	)
+
+
+def schedule_pipeline(customers, email_account=None, timings=None):
+	"""Reserve a chunk's send slots from the Email Account's shared bucket.
+
+	Returns the customers whose slot is within MAX_PIPELINE_WAIT, each with the `delay` in seconds
+	the pipeline holds it back, and the later ones, each with the `send_after` to queue it with.
+	"""
+	timings = {} if timings is None else timings
+	now = now_datetime()
+	with timer(timings, "send_scheduling"):
+		send_times = get_send_times(len(customers), email_account, now)
+
+	pipelined, paced = [], []
+	for customer, send_after in zip(customers, send_times, strict=True):
+		customer.delay = (send_after - now).total_seconds() if send_after else 0
+		if customer.delay <= MAX_PIPELINE_WAIT:
+			pipelined.append(customer)
+		else:
+			customer.send_after = send_after
+			paced.append(customer)
+	return pipelined, paced
+
+
+def deliver_reminders(
+	customers, compiled_template, company, subject, sender, timings=None, email_account=None
+):
+	"""Render and send a chunk's emails straight to the SMTP server through the delivery pipeline.
+
+	Each customer is held back for its `delay`, see `schedule_pipeline`. Delivered emails get their
+	Communication and ledger entries committed in small batches while the pipeline runs, so a job
+	killed part way does not send them again. Failed ones get none and are picked up by the next run.
+	"""
+	if not customers:
+		return {}
+
+	timings = {} if timings is None else timings
+	settings = frappe.get_cached_doc("Compliance Plus Settings")
+	pipeline = DeliveryPipeline(
+		get_smtp_connector(email_account, sender),
+		connections=settings.smtp_connections or 4,
+		max_retries=settings.send_retries,
+	)
+
+	def render(customer):
+		html = compiled_template.render(get_reminder_context(customer, company))
+		return build_email(sender, customer.email_id, subject, html)
+
+	def log_sent(deliveries):
+		sent = [get_reminder_record(delivery.item, subject) for delivery in deliveries]
 		try:
-			frappe.sendmail(
-				recipients=[customer.email_id], sender=sender, subject=template.subject, message=message
-			)
-			log_communication(customer.name, template.subject)
-			logger.info(f"Email queued for {customer.email_id}")
-			emails_sent += 1
+			with timer(timings, "communication_insert"):
+				insert_communications(sent)
+				record_reminders(sent)
+			frappe.db.commit()
 		except Exception:
-			frappe.log_error("Email Send Failed", frappe.get_traceback())
-			logger.error(f"Failed to send email to {customer.email_id}")
+			frappe.db.rollback()
+			frappe.log_error("Reminder Logging Failed", frappe.get_traceback())
+			logger.error(f"Failed to record {len(sent)} delivered reminder emails")
 
-	logger.info(
-		f"License expiry reminder cron completed: {emails_sent} emails sent, {customers_skipped} customers skipped"
+	with timer(timings, "sendmail"):
+		deliveries = pipeline.run(
+			customers, render, [customer.get("delay") for customer in customers], on_sent=log_sent
+		)
+
+	sent = [delivery for delivery in deliveries if delivery.status == "Sent"]
+	failed = [delivery for delivery in deliveries if delivery.status == "Failed"]
+	if failed:
+		frappe.log_error(
+			"Email Send Failed",
+			"\n".join(
+				f"{delivery.item.name} ({delivery.attempts} attempts): {delivery.error}"
+				for delivery in failed
+			),
+		)
+		logger.error(f"Failed to deliver {len(failed)} of {len(deliveries)} reminder emails")
+
+	failed_renders = sum(1 for delivery in failed if delivery.attempts == 0)
+	return {
+		"emails_sent": len(sent),
+		"failed_renders": failed_renders,
+		"failed_sends": len(failed) - failed_renders,
+	}
+
+
+def queue_reminders(outgoing, sender, timings=None, email_account=None):
+	"""Queue a chunk's emails, log their Communications and ledger entries in a single transaction."""
+	if not outgoing:
+		return 0
+
+	timings = {} if timings is None else timings
+	try:
+		with timer(timings, "sendmail"):
+			queued = queue_emails(outgoing, sender, email_account)
+		with timer(timings, "communication_insert"):
+			insert_communications(queued)
+			record_reminders(queued)
+		frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error("Email Send Failed", frappe.get_traceback())
+		logger.error(f"Failed to queue {len(outgoing)} reminder emails")
+		return 0
+
+	for message in queued:
+		logger.info(f"Email queued for {message.recipients[0]}")
+	return len(queued)
+
+
+def start_run(started_at, total_chunks, skipped, timings, query_count, mode="Full"):
+	"""Create the Reminder Run Log the chunks of this run report into."""
+	run_log = frappe.get_doc(
+		{
+			"doctype": "Reminder Run Log",
+			"started_at": started_at,
+			"mode": mode,
+			"status": "Running",
+			"total_chunks": total_chunks,
+			"pending_chunks": total_chunks,
+			"customers_skipped": sum(skipped.values()),
+			"skipped_no_expiring_licenses": skipped["no_expiring_licenses"],
+			"skipped_no_email": skipped["no_email"],
+			"skipped_recently_sent": skipped["recently_sent"],
+			"query_count": query_count,
+			**{f"{phase}_time": seconds for phase, seconds in timings.items()},
+		}
+	).insert(ignore_permissions=True)
+	frappe.db.set_single_value("Compliance Plus Settings", "last_reminder_run", run_log.name)
+	frappe.db.commit()
+	return run_log.name
+
+
+def finish_chunk(run_log, counters, timings, query_count, failed=False):
+	"""Add a chunk's counters to its run; the last chunk to finish closes the run.
+
+	Counters are incremented in SQL, so concurrent chunks never overwrite each other.
+	"""
+	increments = {
+		**counters,
+		"customers_skipped": counters["skipped_recently_sent"],
+		"query_count": query_count,
+		"failed_chunks": 1 if failed else 0,
+		"pending_chunks": -1,
+		**{f"{phase}_time": seconds for phase, seconds in timings.items()},
+	}
+	frappe.db.sql(
+		f"""
+		update `tabReminder Run Log`
+		set {", ".join(f"`{field}` = `{field}` + %({field})s" for field in increments)}
+		where name = %(run_log)s
+		""",
+		dict(increments, run_log=run_log),
+	)
+
+	# the row stays locked by the update above until commit, so exactly one chunk sees 0
+	run = frappe.db.get_value(
+		"Reminder Run Log",
+		run_log,
+		[
+			"pending_chunks",
+			"failed_chunks",
+			"failed_renders",
+			"failed_sends",
+			"emails_sent",
+			"customers_skipped",
+			"started_at",
+			"mode",
+		],
+		as_dict=True,
+	)
+	if run.pending_chunks <= 0:
+		finished_at = now_datetime()
+		frappe.db.set_value(
+			"Reminder Run Log",
+			run_log,
+			{
+				"status": "Failed" if run.failed_chunks else "Completed",
+				"finished_at": finished_at,
+				"total_time": time_diff_in_seconds(finished_at, run.started_at),
+			},
+			update_modified=False,
+		)
+		# customers whose reminder failed are only retried if the next run still looks at them
+		if not (run.failed_chunks or run.failed_renders or run.failed_sends):
+			advance_watermark(run)
+		logger.info(
+			f"License expiry reminder cron completed: {run.emails_sent} emails sent, {run.customers_skipped} customers skipped"
+		)
+
+	frappe.db.commit()
+
+
+def close_stale_runs():
+	"""Fail runs still Running after STALE_RUN_HOURS, whose chunk workers died or timed out.
+
+	Runs hourly. The chunks that never reported back count as failed, so the watermark stays put.
+	"""
+	now = now_datetime()
+	stale = frappe.get_all(
+		"Reminder Run Log",
+		filters={"status": "Running", "started_at": ["<", add_to_date(now, hours=-STALE_RUN_HOURS)]},
+		pluck="name",
+	)
+	if not stale:
+		return
+
+	frappe.db.sql(
+		"""
+		update `tabReminder Run Log`
+		set status = 'Failed', failed_chunks = failed_chunks + greatest(pending_chunks, 0), pending_chunks = 0,
+			finished_at = %(now)s, total_time = timestampdiff(second, started_at, %(now)s)
+		where name in %(stale)s and status = 'Running'
+		""",
+		{"now": now, "stale": stale},
 	)
+	frappe.db.commit()
+	logger.warning(f"Closed {len(stale)} stale reminder runs: {', '.join(stale)}")
+
+
+def advance_watermark(run):
+	"""Let the next incremental run start from this successful run.
+
+	The watermark is the run's start, so rows changed while it ran are picked up next time.
+	"""
+	values = {"reminder_watermark": run.started_at}
+	if run.mode == "Full":
+		values["last_full_sweep"] = getdate(run.started_at)
+	frappe.db.set_single_value("Compliance Plus Settings", values)
@@ -0,0 +1,98 @@
+import frappe
+from frappe.model.naming import NamingSeries, set_name_from_naming_options
+from frappe.utils import cint
+
+# trackers that share a naming series; in block naming mode each gets its own counter
+SEPARATE_COUNTERS = ("Insurance Tracker", "Hearing Tracker")
+
+# (counter key, settings version) -> [next number, last number] reserved by this worker
+_name_blocks = {}
+
+
+def set_tracker_name(doc):
+	"""Name a tracker from its naming series, taking numbers from a per-worker block when enabled.
+
+	Called from the tracker controllers' `autoname`.
+	"""
+	settings = frappe.get_cached_doc("Compliance Plus Settings")
+	if not settings.block_naming:
+		set_name_from_naming_options(doc.meta.autoname, doc)
+		return
+
+	series = doc.naming_series or doc.meta.get_field("naming_series").options.split("\n")[0]
+	prefix = NamingSeries(series).get_prefix()
+	key = get_counter_key(doc.doctype, prefix, settings)
+	# saving the settings starts new blocks everywhere, so toggling the mode never reuses numbers
+	block_key = (key, str(settings.modified))
+
+	block = _name_blocks.get(block_key)
+	if not block or block[0] > block[1]:
+		size = settings.naming_block_size or 50
+		start = reserve_block(key, size, prefix if key != prefix else None)
+		block = _name_blocks[block_key] = [start, start + size - 1]
+		# a rolled back reservation is handed out again by the counter, so drop it here too
+		frappe.db.after_rollback.add(lambda: _name_blocks.pop(block_key, None))
+
+	number = block[0]
+	block[0] += 1
+	doc.name = f"{prefix}{str(number).zfill(get_digits(series))}"
+
+
+def get_counter_key(doctype, prefix, settings=None):
+	"""Return the tabSeries row a doctype's numbers come from."""
+	settings = settings or frappe.get_cached_doc("Compliance Plus Settings")
+	if settings.block_naming and doctype in SEPARATE_COUNTERS:
+		return f"{prefix}|{doctype}"
+	return prefix
+
+
+def get_digits(series):
+	return series.rsplit(".", 1)[-1].count("#") or 5
+
+
+def reserve_block(key, count, seed_key=None):
+	"""Reserve `count` numbers of counter `key` with one locked update and return the first.
+
+	A separate counter starts after its shared `seed_key`, so it never hands out a number
+	the shared counter already used.
+	"""
+	current = frappe.db.sql("select `current` from `tabSeries` where `name` = %s for update", (key,))
+	start = cint(current[0][0]) if current else 0
+	if seed_key:
+		seed = frappe.db.sql("select `current` from `tabSeries` where `name` = %s", (seed_key,))
+		start = max(start, cint(seed[0][0]) if seed else 0)
+
+	frappe.db.sql(
+		"""
+		insert into `tabSeries` (`name`, `current`) values (%(key)s, %(current)s)
+		on duplicate key update `current` = %(current)s
+		""",
+		{"key": key, "current": start + count},
+	)
+	return start + 1
+
+
+def reserve_series_block(series, count, doctype=None):
+	"""Allocate `count` consecutive names of a naming series.
+
+	Uses the same `tabSeries` counters as regular naming, so inserts continue after the block.
+	"""
+	prefix = NamingSeries(series).get_prefix()
+	key = get_counter_key(doctype, prefix) if doctype else prefix
+	start = reserve_block(key, count, prefix if key != prefix else None)
+	return [f"{prefix}{str(number).zfill(get_digits(series))}" for number in range(start, start + count)]
+
+
+def merge_block_counters():
+	"""Move every shared counter past its separate ones, before regular naming takes over again."""
+	for doctype in SEPARATE_COUNTERS:
+		for key, current in frappe.db.sql(
+			"select `name`, `current` from `tabSeries` where `name` like %s", (f"%|{doctype}",)
+		):
+			frappe.db.sql(
+				"""
+				insert into `tabSeries` (`name`, `current`) values (%(prefix)s, %(current)s)
+				on duplicate key update `current` = greatest(`current`, %(current)s)
+				""",
+				{"prefix": key.rsplit("|", 1)[0], "current": current},
+			)
@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+
+import frappe
+
+
+class QueryCounter:
+	"""Count `frappe.db.sql` calls made while the counter is active."""
+
+	def __init__(self):
+		self.count = 0
+
+	def __enter__(self):
+		self.db = frappe.db
+		self.wrapped = self.db.__dict__.get("sql")
+		sql = self.db.sql
+
+		def counted_sql(*args, **kwargs):
+			self.count += 1
+			return sql(*args, **kwargs)
+
+		self.db.sql = counted_sql
+		return self
+
+	def __exit__(self, *exc):
+		# counters can nest, so put back whatever was there before
+		if self.wrapped:
+			self.db.sql = self.wrapped
+		else:
+			del self.db.sql
+
+
+@contextmanager
+def timer(timings, key):
+	"""Add the seconds spent in the block to `timings[key]`."""
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		timings[key] = timings.get(key, 0) + time.perf_counter() - start
@@ -0,0 +1,103 @@
+import hashlib
+from collections import Counter
+
+import frappe
+from frappe.utils import add_days, add_months, cint, getdate
+
+# filters -> projected renewals; dropped whenever a Subscription Tracker changes
+CACHE_KEY = "compliance_plus_renewal_projection"
+PERIOD_MONTHS = {"Monthly": 1, "Yearly": 12}
+DEFAULT_MONTHS = 12
+MAX_MONTHS = 24
+
+
+@frappe.whitelist()
+def get_renewal_projection(from_date=None, months=DEFAULT_MONTHS, include_expired=0, in_charge=None):
+	"""Projected Subscription Tracker renewals for `months` from `from_date`, with per-month counts."""
+	frappe.has_permission("Subscription Tracker", "read", throw=True)
+	return get_cached_projection(get_projection_filters(from_date, months, include_expired, in_charge))
+
+
+def get_projection_filters(from_date=None, months=DEFAULT_MONTHS, include_expired=0, in_charge=None):
+	from_date = getdate(from_date)
+	months = min(max(cint(months) or DEFAULT_MONTHS, 1), MAX_MONTHS)
+	return frappe._dict(
+		from_date=str(from_date),
+		to_date=str(add_days(add_months(from_date, months), -1)),
+		months=months,
+		include_expired=cint(include_expired),
+		in_charge=in_charge or None,
+	)
+
+
+def get_cached_projection(filters):
+	key = hashlib.md5(frappe.as_json(filters).encode()).hexdigest()
+	projection = frappe.cache().hget(CACHE_KEY, key)
+	if projection is None:
+		projection = project_renewals(filters)
+		frappe.cache().hset(CACHE_KEY, key, projection)
+	return projection
+
+
+def clear_projection_cache(doc=None, method=None):
+	"""Hooked to Subscription Tracker changes; also called after bulk status updates."""
+	frappe.cache().delete_value(CACHE_KEY)
+
+
+def project_renewals(filters):
+	"""Expand the renewals of every subscription in the window with a single query.
+
+	Each subscription renews at `end_date` and every period after it. The periods are a
+	recursive CTE sequence joined to all subscriptions at once, and every occurrence is
+	computed from `end_date` with DATE_ADD, so month ends clamp the way MariaDB does
+	(Jan 31 -> Feb 28 -> Mar 31) instead of drifting. Occurrences before the window are
+	skipped arithmetically, however old the subscription.
+	"""
+	values = dict(filters, steps=filters.months + 1)
+	conditions = []
+	if not filters.include_expired:
+		conditions.append("s.status != 'Expired'")
+	if filters.in_charge:
+		conditions.append("s.in_charge = %(in_charge)s")
+
+	periods = " union all ".join(
+		f"select {frappe.db.escape(subscription_type)} as subscription_type, {months} as months"
+		for subscription_type, months in PERIOD_MONTHS.items()
+	)
+
+	renewals = frappe.db.sql(
+		f"""
+		with recursive steps (n) as (
+			select 0
+			union all
+			select n + 1 from steps where n < %(steps)s
+		)
+		select * from (
+			select s.name as subscription, s.document_name, s.type, s.issuer_supplier,
+				s.subscription_type, s.status, s.in_charge, s.end_date,
+				date_add(
+					s.end_date,
+					interval (
+						greatest(0, floor(timestampdiff(month, s.end_date, %(from_date)s) / p.months)) + steps.n
+					) * p.months month
+				) as renewal_date
+			from `tabSubscription Tracker` s
+			inner join ({periods}) p on p.subscription_type = s.subscription_type
+			cross join steps
+			where s.end_date is not null {"".join(f" and {condition}" for condition in conditions)}
+		) renewals
+		where renewal_date between %(from_date)s and %(to_date)s
+		order by renewal_date, subscription
+		""",
+		values,
+		as_dict=True,
+	)
+
+	per_month = Counter(row.renewal_date.strftime("%Y-%m") for row in renewals)
+	start = getdate(filters.from_date)
+	months = [add_months(start, i).strftime("%Y-%m") for i in range(filters.months)]
+	return frappe._dict(
+		renewals=renewals,
+		per_month=[{"month": month, "renewals": per_month.get(month, 0)} for month in months],
+		total=len(renewals),
+	)
@@ -0,0 +1,96 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from compliance_plus.compliance_plus.custom.bulk_import import bulk_import
+from compliance_plus.compliance_plus.custom.naming import reserve_series_block
+
+
+class TestBulkImport(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		self.delete_imported()
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		self.delete_imported()
+		frappe.db.commit()
+
+	def delete_imported(self):
+		names = frappe.get_all(
+			"Licence Tracker", filters={"document_name": ["like", "Test Import%"]}, pluck="name"
+		)
+		if names:
+			frappe.db.delete(
+				"Compliance Expiry Index", {"source_doctype": "Licence Tracker", "source_name": ["in", names]}
+			)
+		frappe.db.delete("Licence Tracker", {"document_name": ["like", "Test Import%"]})
+
+	def make_row(self, name, **kwargs):
+		return {
+			"document_name": name,
+			"issuer_supplier": "Test Authority",
+			"issue_date": str(add_days(getdate(), -400)),
+			"expiry_date": str(add_days(getdate(), 100)),
+			"status": "Active",
+			"in_charge": "Administrator",
+			**kwargs,
+		}
+
+	def test_bulk_import_reports_row_errors(self):
+		"""Test that valid rows are inserted and every invalid row is reported with its number."""
+		rows = [
+			self.make_row("Test Import Valid 1"),
+			self.make_row("Test Import Missing", issuer_supplier=""),
+			self.make_row("Test Import Bad Status", status="Lapsed"),
+			self.make_row("Test Import Bad User", in_charge="missing-user@example.com"),
+			self.make_row("Test Import Bad Date", expiry_date="not a date"),
+			self.make_row("Test Import Valid 2"),
+		]
+
+		result = bulk_import("Licence Tracker", rows, batch_size=4)
+
+		self.assertEqual(len(result.imported), 2)
+		self.assertEqual([error["row"] for error in result.errors], [2, 3, 4, 5])
+		self.assertIn("Issuer", result.errors[0]["errors"][0])
+		self.assertIn("missing-user@example.com", result.errors[2]["errors"][0])
+
+		doc = frappe.get_doc("Licence Tracker", result.imported[0])
+		self.assertEqual(doc.document_name, "Test Import Valid 1")
+		self.assertTrue(doc.name.startswith("LIT-"))
+		self.assertTrue(
+			frappe.db.exists(
+				"Compliance Expiry Index", {"source_doctype": "Licence Tracker", "source_name": doc.name}
+			)
+		)
+
+	def test_bulk_import_reports_database_errors(self):
+		"""Test that a row the database rejects is reported without losing the rest of its batch."""
+		rows = [
+			self.make_row("Test Import Fits 1"),
+			self.make_row("Test Import Too Long " + "x" * 200),
+			self.make_row("Test Import Fits 2", expiry_date=str(add_days(getdate(), -5))),
+		]
+
+		result = bulk_import("Licence Tracker", rows)
+
+		self.assertEqual(len(result.imported), 2)
+		self.assertEqual([error["row"] for error in result.errors], [2])
+		# statuses are derived for the imported trackers
+		self.assertEqual(frappe.db.get_value("Licence Tracker", result.imported[1], "status"), "Expired")
+
+	def test_reserve_series_block(self):
+		"""Test that blocks are consecutive and regular naming continues after them."""
+		first = reserve_series_block("TEST-IMPORT-.####", 3)
+		second = reserve_series_block("TEST-IMPORT-.####", 2)
+
+		self.assertEqual(first, ["TEST-IMPORT-0001", "TEST-IMPORT-0002", "TEST-IMPORT-0003"])
+		self.assertEqual(second, ["TEST-IMPORT-0004", "TEST-IMPORT-0005"])
+		frappe.db.rollback()
+
+	def test_rejects_non_tracker_doctype(self):
+		"""Test that only tracker doctypes can be bulk imported."""
+		self.assertRaises(frappe.ValidationError, bulk_import, "User", [])
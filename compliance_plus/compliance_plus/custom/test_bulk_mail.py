@@ -0,0 +1,59 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.compliance_plus.custom.bulk_mail import insert_communications, queue_emails
+
+
+class TestBulkMail(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.db.delete("Communication", {"reference_name": ["like", "Test Customer Bulk%"]})
+		frappe.db.delete("Email Queue", {"sender": "bulk-sender@example.com"})
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+	def test_insert_communications_fields(self):
+		"""Test that bulk Communications are linked Automated Messages about their reference."""
+		insert_communications(
+			[
+				frappe._dict(reference_doctype="Customer", reference_name=name, subject="Bulk Subject")
+				for name in ("Test Customer Bulk 1", "Test Customer Bulk 2")
+			]
+		)
+
+		comms = frappe.get_all(
+			"Communication",
+			filters={"reference_name": ["like", "Test Customer Bulk%"]},
+			fields=["communication_type", "subject", "reference_doctype", "sent_or_received", "status"],
+		)
+		self.assertEqual(len(comms), 2)
+		for comm in comms:
+			self.assertEqual(comm.communication_type, "Automated Message")
+			self.assertEqual(comm.subject, "Bulk Subject")
+			self.assertEqual(comm.reference_doctype, "Customer")
+			self.assertEqual(comm.sent_or_received, "Sent")
+			self.assertEqual(comm.status, "Linked")
+
+	def test_queue_emails_creates_queue_with_recipients(self):
+		"""Test that each message becomes one Email Queue row with its recipients."""
+		messages = [
+			frappe._dict(recipients=["bulk1@example.com"], subject="Bulk Subject", message="<p>One</p>"),
+			frappe._dict(recipients=["bulk2@example.com"], subject="Bulk Subject", message="<p>Two</p>"),
+		]
+
+		queued = queue_emails(messages, "bulk-sender@example.com")
+
+		self.assertEqual(len(queued), 2)
+		queue_names = frappe.get_all(
+			"Email Queue", filters={"sender": "bulk-sender@example.com"}, pluck="name"
+		)
+		self.assertEqual(len(queue_names), 2)
+		for name in queue_names:
+			queue = frappe.get_doc("Email Queue", name)
+			self.assertEqual(queue.status, "Not Sent")
+			self.assertEqual(len(queue.recipients), 1)
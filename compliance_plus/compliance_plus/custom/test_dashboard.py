@@ -0,0 +1,63 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from compliance_plus.compliance_plus.custom.dashboard import (
+	CACHE_KEY,
+	CHART_WEEKS,
+	clear_dashboard_cache,
+	get_active_trackers,
+	get_expired_trackers,
+	get_summary,
+)
+
+
+class TestDashboard(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		clear_dashboard_cache()
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.set_user("Administrator")
+		frappe.db.rollback()
+		clear_dashboard_cache()
+
+	def make_licence(self, name, expiry_date, status):
+		return frappe.get_doc(
+			{
+				"doctype": "Licence Tracker",
+				"document_name": name,
+				"issuer_supplier": "Test Authority",
+				"issue_date": add_days(getdate(), -400),
+				"expiry_date": expiry_date,
+				"status": status,
+			}
+		).insert()
+
+	def test_summary_is_cached_until_a_tracker_changes(self):
+		"""Test that card values come from the cache and a tracker save invalidates it."""
+		expired = get_expired_trackers()["value"]
+		self.assertIsNotNone(frappe.cache().get_value(CACHE_KEY))
+
+		self.make_licence("Test Dashboard Expired", add_days(getdate(), -3), "Expired")
+
+		self.assertIsNone(frappe.cache().get_value(CACHE_KEY))
+		self.assertEqual(get_expired_trackers()["value"], expired + 1)
+
+	def test_expirations_per_week(self):
+		"""Test that the chart has one bucket per week and counts indexed expiries."""
+		before = sum(week["total"] for week in get_summary().expirations_per_week)
+		self.make_licence("Test Dashboard Week", add_days(getdate(), 8), "Active")
+
+		weeks = get_summary().expirations_per_week
+		self.assertEqual(len(weeks), CHART_WEEKS)
+		self.assertEqual(sum(week["total"] for week in weeks), before + 1)
+
+	def test_cards_need_tracker_read_permission(self):
+		"""Test that users who cannot read the trackers get no card values."""
+		frappe.set_user("Guest")
+		self.assertRaises(frappe.PermissionError, get_active_trackers)
@@ -0,0 +1,99 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import smtplib
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, get_datetime
+
+from compliance_plus.benchmarks.smtp_stand_in import SMTPStandIn
+from compliance_plus.compliance_plus.custom.delivery import BUCKET_KEY, TokenBucket, get_send_times
+
+NOW = get_datetime("2025-07-01 09:00:00")
+
+
+class TestDelivery(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.cache().delete_value(BUCKET_KEY)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.cache().delete_value(BUCKET_KEY)
+
+	def set_limits(self, messages_per_minute, delivery_window):
+		frappe.db.set_single_value("Compliance Plus Settings", "messages_per_minute", messages_per_minute)
+		frappe.db.set_single_value("Compliance Plus Settings", "delivery_window", delivery_window)
+
+	def get_offsets(self, send_times):
+		return [round((send_time - NOW).total_seconds(), 3) for send_time in send_times]
+
+	def test_token_bucket(self):
+		"""Test that the bucket allows a burst of `capacity`, then one token per 1 / rate seconds."""
+		bucket = TokenBucket(rate=1, capacity=2)
+
+		self.assertEqual([bucket.reserve(0) for _i in range(4)], [0, 0, 1, 2])
+		# tokens refill while idle, up to capacity
+		self.assertEqual(bucket.reserve(10), 10)
+		self.assertEqual(bucket.reserve(10), 10)
+		self.assertEqual(bucket.reserve(10), 11)
+
+	def test_unthrottled(self):
+		"""Test that no limits leave send_after empty."""
+		self.set_limits(0, 0)
+		self.assertEqual(get_send_times(3, now=NOW), [None, None, None])
+
+	def test_messages_per_minute(self):
+		"""Test that sends past the first minute's burst follow the per-minute rate."""
+		self.set_limits(60, 0)
+
+		offsets = self.get_offsets(get_send_times(62, now=NOW))
+
+		self.assertEqual(offsets[:60], [0] * 60)
+		self.assertEqual(offsets[60:], [1, 2])
+
+	def test_delivery_window(self):
+		"""Test that a small run is spread evenly across the delivery window."""
+		self.set_limits(0, 10)
+
+		offsets = self.get_offsets(get_send_times(5, now=NOW))
+
+		self.assertEqual(offsets, [0, 120, 240, 360, 480])
+
+	def test_bucket_shared_per_email_account(self):
+		"""Test that consecutive runs through one Email Account share its limit."""
+		self.set_limits(1, 0)
+
+		first = get_send_times(2, "Test Account", now=NOW)
+		second = get_send_times(1, "Test Account", now=NOW)
+		other = get_send_times(1, "Other Account", now=NOW)
+
+		self.assertEqual(self.get_offsets(first + second), [0, 60, 120])
+		self.assertEqual(self.get_offsets(other), [0])
+
+	def test_paced_delivery_to_smtp_stand_in(self):
+		"""Test that releasing messages at their send_after keeps the stand-in within the limit."""
+		self.set_limits(2, 0)
+		send_times = get_send_times(6, now=NOW)
+		clock = frappe._dict(now=NOW)
+
+		with SMTPStandIn(clock=lambda: clock.now) as server:
+			pending = list(enumerate(send_times))
+			connection = smtplib.SMTP(server.host, server.port)
+			for minute in range(4):
+				clock.now = add_to_date(NOW, minutes=minute)
+				while pending and pending[0][1] <= clock.now:
+					idx, _send_after = pending.pop(0)
+					connection.sendmail(
+						"reminders@example.com", [f"customer{idx}@example.com"], f"Subject: {idx}\r\n\r\nDue"
+					)
+			connection.quit()
+
+		self.assertEqual(len(server.messages), 6)
+		per_minute = {}
+		for message in server.messages:
+			per_minute[message.received_at] = per_minute.get(message.received_at, 0) + 1
+		# a burst of two, then two a minute
+		self.assertEqual(list(per_minute.values()), [2, 2, 2])
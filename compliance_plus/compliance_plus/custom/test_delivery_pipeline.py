@@ -0,0 +1,126 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import smtplib
+from email import message_from_bytes
+
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.benchmarks.smtp_stand_in import SMTPStandIn
+from compliance_plus.compliance_plus.custom.delivery_pipeline import DeliveryPipeline, build_email
+
+SENDER = "Reminders <reminders@example.com>"
+
+
+def render(idx):
+	html = f"<p>Licence {idx} expires soon</p>"
+	return build_email(SENDER, f"customer{idx}@example.com", f"Reminder {idx}", html)
+
+
+class TestDeliveryPipeline(FrappeTestCase):
+	def get_pipeline(self, server, **kwargs):
+		return DeliveryPipeline(lambda: smtplib.SMTP(server.host, server.port), retry_delay=0, **kwargs)
+
+	def test_delivers_over_pooled_connections(self):
+		"""Test that every message arrives, over no more than the configured connections."""
+		with SMTPStandIn() as server:
+			deliveries = self.get_pipeline(server, connections=3).run(range(60), render)
+
+		self.assertEqual([delivery.status for delivery in deliveries], ["Sent"] * 60)
+		self.assertEqual(len(server.messages), 60)
+		self.assertLessEqual(server.connections, 3)
+		self.assertEqual(
+			sorted(message.rcpt_tos[0] for message in server.messages),
+			sorted(f"<customer{idx}@example.com>" for idx in range(60)),
+		)
+		message = message_from_bytes(server.messages[0].data)
+		self.assertEqual(message.get_content_type(), "text/html")
+
+	def test_rendering_is_bounded_by_queue_size(self):
+		"""Test that rendering never runs more than queue_size messages ahead of delivery."""
+		rendered, ahead = [], []
+
+		with SMTPStandIn() as server:
+
+			def tracked_render(idx):
+				rendered.append(idx)
+				ahead.append(len(rendered) - len(server.messages))
+				return render(idx)
+
+			self.get_pipeline(server, connections=2, queue_size=5).run(range(100), tracked_render)
+
+		self.assertEqual(len(server.messages), 100)
+		self.assertLessEqual(max(ahead), 5)
+
+	def test_delays_hold_messages_back(self):
+		"""Test that a message is not sent before its delay, without holding up the others."""
+		with SMTPStandIn() as server:
+			deliveries = self.get_pipeline(server, connections=2).run(range(2), render, [0.3, 0])
+
+		self.assertEqual([delivery.status for delivery in deliveries], ["Sent", "Sent"])
+		self.assertEqual(
+			[message.rcpt_tos[0] for message in server.messages],
+			["<customer1@example.com>", "<customer0@example.com>"],
+		)
+
+	def test_sent_deliveries_are_reported_in_batches(self):
+		"""Test that sent deliveries are handed to on_sent in batches while the run goes on."""
+		batches = []
+		with SMTPStandIn() as server:
+			self.get_pipeline(server, connections=2, sent_batch_size=3).run(
+				range(7), render, on_sent=batches.append
+			)
+
+		self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+		self.assertEqual(sorted(delivery.item for batch in batches for delivery in batch), list(range(7)))
+
+	def test_temporary_failures_are_retried(self):
+		"""Test that 4xx replies are retried and each delivery counts its attempts."""
+		with SMTPStandIn(fail_data=2) as server:
+			deliveries = self.get_pipeline(server, connections=1).run(range(3), render)
+
+		self.assertEqual(len(server.messages), 3)
+		self.assertEqual([delivery.status for delivery in deliveries], ["Sent"] * 3)
+		self.assertEqual([delivery.attempts for delivery in deliveries], [3, 1, 1])
+
+	def test_retries_are_limited(self):
+		"""Test that a message fails once its retries are used up."""
+		with SMTPStandIn(fail_data=5) as server:
+			deliveries = self.get_pipeline(server, connections=1, max_retries=1).run(range(1), render)
+
+		self.assertEqual(deliveries[0].status, "Failed")
+		self.assertEqual(deliveries[0].attempts, 2)
+		self.assertIn("Try again later", deliveries[0].error)
+
+	def test_permanent_failures_are_not_retried(self):
+		"""Test that refused recipients and render errors fail without holding up other messages."""
+
+		def failing_render(idx):
+			if idx == 1:
+				raise ValueError("undefined variable")
+			return render(idx)
+
+		with SMTPStandIn(reject={"customer2@example.com"}) as server:
+			deliveries = self.get_pipeline(server).run(range(4), failing_render)
+
+		self.assertEqual([delivery.status for delivery in deliveries], ["Sent", "Failed", "Failed", "Sent"])
+		self.assertEqual(deliveries[1].attempts, 0)
+		self.assertEqual(deliveries[2].attempts, 1)
+		self.assertEqual(len(server.messages), 2)
+
+	def test_reconnects_after_connection_failure(self):
+		"""Test that a failed connection attempt is retried with a new connection."""
+		with SMTPStandIn() as server:
+			attempts = []
+
+			def flaky_connect():
+				attempts.append(1)
+				if len(attempts) == 1:
+					raise ConnectionRefusedError("refused")
+				return smtplib.SMTP(server.host, server.port)
+
+			deliveries = DeliveryPipeline(flaky_connect, connections=1, retry_delay=0).run(range(2), render)
+
+		self.assertEqual([delivery.status for delivery in deliveries], ["Sent", "Sent"])
+		self.assertEqual(deliveries[0].attempts, 2)
+		self.assertEqual(len(attempts), 2)
@@ -0,0 +1,178 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import json
+
+import frappe
+from frappe.permissions import add_user_permission
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, today
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from compliance_plus.compliance_plus.custom.expiry_index import (
+	get_due_entries,
+	get_due_items,
+	rebuild_expiry_index,
+)
+
+
+class TestExpiryIndex(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.db.delete("Licence Tracker", {"document_name": ["like", "Test Index%"]})
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+	def make_licence(self, name, days_to_expiry):
+		return frappe.get_doc(
+			{
+				"doctype": "Licence Tracker",
+				"document_name": name,
+				"issuer_supplier": "Test Authority",
+				"issue_date": add_days(today(), -400),
+				"expiry_date": add_days(today(), days_to_expiry),
+				"status": "Active",
+				"in_charge": "Administrator",
+			}
+		).insert()
+
+	def get_entry(self, licence):
+		return frappe.db.get_value(
+			"Compliance Expiry Index",
+			{"source_doctype": "Licence Tracker", "source_name": licence.name},
+			["due_date", "kind", "in_charge", "title"],
+			as_dict=True,
+		)
+
+	def test_entry_follows_tracker(self):
+		"""Test that the index entry is kept in sync on insert, update and delete."""
+		licence = self.make_licence("Test Index Sync", 20)
+
+		entry = self.get_entry(licence)
+		self.assertEqual(entry.due_date, getdate(add_days(today(), 20)))
+		self.assertEqual(entry.kind, "Expiry")
+		self.assertEqual(entry.in_charge, "Administrator")
+		self.assertEqual(entry.title, "Test Index Sync")
+
+		licence.expiry_date = add_days(today(), 40)
+		licence.save()
+		self.assertEqual(self.get_entry(licence).due_date, getdate(add_days(today(), 40)))
+
+		licence.delete()
+		self.assertIsNone(self.get_entry(licence))
+
+	def test_rebuild_matches_incremental_sync(self):
+		"""Test that a bulk rebuild produces the same entry as the doc_events sync."""
+		licence = self.make_licence("Test Index Rebuild", 10)
+		before = frappe.get_all(
+			"Compliance Expiry Index", filters={"source_name": licence.name}, pluck="name"
+		)
+
+		rebuild_expiry_index()
+
+		after = frappe.get_all("Compliance Expiry Index", filters={"source_name": licence.name}, pluck="name")
+		self.assertEqual(before, after)
+
+	def test_get_due_entries(self):
+		"""Test that due entries are looked up by date window."""
+		due = self.make_licence("Test Index Due", 5)
+		later = self.make_licence("Test Index Later", 90)
+
+		names = {entry.source_name for entry in get_due_entries(today(), add_days(today(), 30))}
+
+		self.assertIn(due.name, names)
+		self.assertNotIn(later.name, names)
+
+	def get_due_items(self, if_none_match=None, **kwargs):
+		headers = {"If-None-Match": if_none_match} if if_none_match else {}
+		request = getattr(frappe.local, "request", None)
+		frappe.local.request = Request(EnvironBuilder(headers=headers).get_environ())
+		try:
+			return get_due_items(**kwargs)
+		finally:
+			frappe.local.request = request
+
+	def test_due_items_cursor(self):
+		"""Test that keyset pages walk the due items in (due_date, name) order without overlap."""
+		names = {self.make_licence(f"Test Index Page {i}", 3 + i % 2).name for i in range(5)}
+
+		seen, cursor = [], None
+		while True:
+			response = self.get_due_items(
+				doctype="Licence Tracker", in_charge="Administrator", cursor=cursor, page_length=2
+			)
+			page = json.loads(response.get_data())["message"]
+			seen.extend(page["items"])
+			cursor = page["next_cursor"]
+			if not cursor:
+				break
+
+		ours = [item for item in seen if item["source_name"] in names]
+		self.assertEqual(len(ours), 5)
+		self.assertEqual(len({item["source_name"] for item in seen}), len(seen))
+		self.assertEqual([item["due_date"] for item in seen], sorted(item["due_date"] for item in seen))
+
+	def test_due_items_invalid_cursor(self):
+		"""Test that a malformed cursor is a validation error instead of a server error."""
+		for cursor in ("garbage", "2025-13-40|LT-0001", "2025-01-01", "2025-01-01|"):
+			with self.assertRaises(frappe.ValidationError):
+				self.get_due_items(cursor=cursor)
+
+	def test_due_items_user_permissions(self):
+		"""Test that a user restricted by User Permissions only gets the trackers they may read."""
+		allowed = self.make_licence("Test Index Allowed", 5)
+		hidden = self.make_licence("Test Index Hidden", 5)
+
+		email = "test-expiry-index@example.com"
+		if not frappe.db.exists("User", email):
+			frappe.get_doc({"doctype": "User", "email": email, "first_name": "Index"}).insert()
+		user = frappe.get_doc("User", email)
+		user.add_roles("System Manager")
+		add_user_permission("Licence Tracker", allowed.name, user.name)
+
+		frappe.set_user(user.name)
+		try:
+			response = self.get_due_items(doctype="Licence Tracker")
+		finally:
+			frappe.set_user("Administrator")
+
+		names = {item["source_name"] for item in json.loads(response.get_data())["message"]["items"]}
+		self.assertIn(allowed.name, names)
+		self.assertNotIn(hidden.name, names)
+
+	def test_due_items_filters(self):
+		"""Test that doctype and status filters narrow the due items."""
+		licence = self.make_licence("Test Index Filter", 5)
+
+		def source_names(**kwargs):
+			items = json.loads(self.get_due_items(**kwargs).get_data())["message"]["items"]
+			return {item["source_name"] for item in items}
+
+		self.assertIn(licence.name, source_names(doctype='["Licence Tracker"]', status="Active"))
+		self.assertNotIn(licence.name, source_names(doctype="Insurance Tracker"))
+		self.assertNotIn(licence.name, source_names(status="Expired"))
+		self.assertNotIn(licence.name, source_names(from_date=add_days(today(), 10)))
+
+	def test_due_items_etag(self):
+		"""Test that a matching If-None-Match gets a 304 until the index changes."""
+		licence = self.make_licence("Test Index ETag", 5)
+		frappe.db.after_commit.run()
+
+		first = self.get_due_items(doctype="Licence Tracker")
+		etag = first.headers["ETag"]
+		self.assertEqual(first.status_code, 200)
+
+		self.assertEqual(self.get_due_items(if_none_match=etag, doctype="Licence Tracker").status_code, 304)
+		# other filters are a different response
+		self.assertEqual(self.get_due_items(if_none_match=etag, doctype="Hearing Tracker").status_code, 200)
+
+		licence.expiry_date = add_days(today(), 6)
+		licence.save()
+		frappe.db.after_commit.run()
+
+		changed = self.get_due_items(if_none_match=etag, doctype="Licence Tracker")
+		self.assertEqual(changed.status_code, 200)
+		self.assertNotEqual(changed.headers["ETag"], etag)
@@ -0,0 +1,34 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.compliance_plus.custom.indexes import (
+	LICENSE_DOCTYPES,
+	add_indexes,
+	explain_hot_queries,
+	get_indexes,
+)
+from compliance_plus.compliance_plus.custom.tracker_reminders import REMINDER_TRACKERS
+
+
+class TestIndexes(FrappeTestCase):
+	def test_indexes_created(self):
+		"""Test that every declared composite index exists after add_indexes."""
+		add_indexes()
+
+		for doctype, _fields, index_name in get_indexes():
+			if frappe.db.table_exists(doctype):
+				self.assertTrue(frappe.db.has_index(f"tab{doctype}", index_name), f"{doctype}: {index_name}")
+
+	def test_explain_hot_queries(self):
+		"""Test that no hot query reads a whole tracker or licence table."""
+		add_indexes()
+		plans = explain_hot_queries()
+
+		self.assertTrue(plans)
+		indexed = {*REMINDER_TRACKERS, *LICENSE_DOCTYPES}
+		for plan in plans:
+			self.assertTrue(plan["plan"])
+			self.assertFalse(indexed.intersection(plan["full_scans"]), plan["query"])
@@ -0,0 +1,74 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import json
+from datetime import date
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.compliance_plus.custom.license_health import (
+	HEALTH_KEY,
+	get_cached_health,
+	get_health,
+	store_health,
+)
+
+TODAY = date(2025, 7, 1)
+
+
+class TestLicenseHealth(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.cache().delete_value(HEALTH_KEY)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.cache().delete_value(HEALTH_KEY)
+
+	def get_raw(self, customer):
+		cache = frappe.cache()
+		value = cache.pipeline().hget(cache.make_key(HEALTH_KEY), customer).execute()[0]
+		return json.loads(value) if value else None
+
+	def test_worst_state_wins(self):
+		"""Test that any expired licence makes the customer Expired, then expiring ones Expiring Soon."""
+		expired = get_health(frappe._dict(expired=1, expiring=2, next_expiry=date(2025, 7, 5)), TODAY)
+		expiring = get_health(frappe._dict(expired=0, expiring=2, next_expiry=date(2025, 7, 5)), TODAY)
+		valid = get_health(frappe._dict(expired=0, expiring=0, next_expiry=date(2026, 1, 1)), TODAY)
+
+		self.assertEqual(expired["state"], "Expired")
+		self.assertEqual(expired["expiring_count"], 2)
+		self.assertEqual(expiring["state"], "Expiring Soon")
+		self.assertEqual(expiring["next_expiry"], "2025-07-05")
+		self.assertEqual(valid["state"], "Valid")
+		self.assertIsNone(get_health(frappe._dict(), TODAY)["state"])
+
+	def test_cached_entries_are_served(self):
+		"""Test that fresh cache entries are returned as stored."""
+		summary = get_health(frappe._dict(expired=1, expiring=0, next_expiry=None), TODAY)
+		store_health({"Test Health Cached": summary})
+
+		self.assertEqual(get_cached_health(["Test Health Cached"], TODAY), {"Test Health Cached": summary})
+
+	def test_stale_and_missing_entries_are_recomputed(self):
+		"""Test that entries from an earlier day, and missing ones, are recomputed and cached."""
+		stale = get_health(frappe._dict(expired=1, expiring=0, next_expiry=None), date(2025, 6, 30))
+		store_health({"Test Health Stale": stale})
+
+		health = get_cached_health(["Test Health Stale", "Test Health Missing"], TODAY)
+
+		# neither customer has licences
+		self.assertIsNone(health["Test Health Stale"]["state"])
+		self.assertIsNone(health["Test Health Missing"]["state"])
+		self.assertEqual(self.get_raw("Test Health Missing")["as_of"], str(TODAY))
+
+	def test_replace_drops_other_entries(self):
+		"""Test that the daily rebuild's replace leaves only the new entries."""
+		summary = get_health(frappe._dict(expired=0, expiring=1, next_expiry=TODAY), TODAY)
+		store_health({"Test Health Old": summary})
+		store_health({"Test Health New": summary}, replace=True)
+
+		self.assertIsNone(self.get_raw("Test Health Old"))
+		self.assertEqual(self.get_raw("Test Health New"), summary)
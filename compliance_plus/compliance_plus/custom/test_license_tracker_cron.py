@@ -1,15 +1,60 @@
 # Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
 # See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today, add_days
+from frappe.utils import add_days, add_to_date, get_datetime, getdate, now_datetime, today
+
 from compliance_plus.compliance_plus.custom.license_tracker_cron import (
-	already_sent_recently,
-	log_communication,
+	MAX_PIPELINE_WAIT,
+	STALE_RUN_HOURS,
+	close_stale_runs,
+	evict_compiled_template,
+	finish_chunk,
+	get_changed_customers,
+	get_compiled_template,
+	get_incremental_watermark,
+	get_reminded_licenses,
+	get_reminder_plan,
+	process_reminder_chunk,
+	record_reminders,
+	schedule_pipeline,
 	send_license_expiry_reminders,
+	start_run,
 )
-from unittest.mock import patch
+
+LICENSE_DOCTYPES = ("Drug License Details", "FSSAI Details")
+
+
+def make_customer(name, dl=(), fssai=(), email_id=None, disabled=0, customer_group=None):
+	"""Insert a Customer with (license_number, expiry_date) rows per licence table."""
+	customer_meta = frappe.get_meta("Customer")
+	tables = {df.options: df.fieldname for df in customer_meta.get_table_fields()}
+	doc = frappe.get_doc(
+		{
+			"doctype": "Customer",
+			"customer_name": name,
+			"customer_type": "Company",
+			"customer_group": customer_group or frappe.db.get_value("Customer Group", {"is_group": 0}),
+			"territory": frappe.db.get_value("Territory", {"is_group": 0}),
+			"disabled": disabled,
+		}
+	)
+	for doctype, licenses in zip(LICENSE_DOCTYPES, (dl, fssai), strict=True):
+		for license_number, expiry_date in licenses:
+			doc.append(tables[doctype], {"license_number": license_number, "expiry_date": expiry_date})
+	doc.insert(ignore_permissions=True)
+	# set directly, so ERPNext does not create a primary Contact from the email
+	frappe.db.set_value("Customer", doc.name, "email_id", email_id)
+	return doc.name
+
+
+def delete_customers(pattern):
+	# through delete_doc, so the on_trash hooks drop their expiry index and health entries too
+	for name in frappe.get_all("Customer", filters={"name": ["like", pattern]}, pluck="name"):
+		frappe.delete_doc("Customer", name, force=1, ignore_permissions=True)
 
 
 class TestLicenseTrackerCron(FrappeTestCase):
@@ -17,52 +62,20 @@ class TestLicenseTrackerCron(FrappeTestCase):
 		"""Set up test fixtures."""
 		# Clean up test data
 		frappe.db.delete("Communication", {"reference_name": ["like", "Test Customer%"]})
+		frappe.db.delete("Reminder Ledger", {"customer": ["like", "Test Customer%"]})
+		delete_customers("Test Customer Plan%")
 		frappe.db.commit()
 
 	def tearDown(self):
 		"""Clean up after tests."""
 		frappe.db.delete("Communication", {"reference_name": ["like", "Test Customer%"]})
+		frappe.db.delete("Reminder Ledger", {"customer": ["like", "Test Customer%"]})
+		delete_customers("Test Customer Plan%")
 		frappe.db.commit()
 
-	def test_already_sent_recently_no_communication(self):
-		"""Test already_sent_recently when no communication exists."""
-		result = already_sent_recently("Test Customer New", 15)
-		self.assertFalse(result)
-
-	def test_already_sent_recently_old_communication(self):
-		"""Test already_sent_recently with old communication."""
-		# Create a communication from 20 days ago
-		old_comm = frappe.get_doc(
-			{
-				"doctype": "Communication",
-				"communication_type": "Automated Message",
-				"subject": "Old Test Message",
-				"reference_doctype": "Customer",
-				"reference_name": "Test Customer Old",
-				"content": "Old test content",
-				"sent_or_received": "Sent",
-			}
-		)
-		old_comm.insert()
-		# Manually set creation date to 20 days ago
-		frappe.db.set_value("Communication", old_comm.name, "creation", add_days(today(), -20))
-
-		result = already_sent_recently("Test Customer Old", 15)
-		self.assertFalse(result)
-
-	def test_log_communication(self):
-		"""Test logging a communication."""
-		log_communication("Test Customer Log", "Test Subject")
-
-		# Verify communication was created
-		comm_exists = frappe.db.exists(
-			"Communication",
-			{"reference_doctype": "Customer", "reference_name": "Test Customer Log", "subject": "Test Subject"},
-		)
-		self.assertTrue(comm_exists)
-
-	@patch("compliance_plus.compliance_plus.custom.license_tracker_cron.frappe.sendmail")
-	def test_send_license_expiry_reminders_no_settings(self, mock_sendmail):
+	@patch("compliance_plus.compliance_plus.custom.license_tracker_cron.deliver_reminders")
+	@patch("compliance_plus.compliance_plus.custom.license_tracker_cron.queue_emails")
+	def test_send_license_expiry_reminders_no_settings(self, mock_queue_emails, mock_deliver_reminders):
 		"""Test send_license_expiry_reminders when settings are not configured."""
 		# Create settings without email template or sender
 		settings = frappe.get_single("Compliance Plus Settings")
@@ -73,42 +86,255 @@ class TestLicenseTrackerCron(FrappeTestCase):
 		# Should return early without error
 		send_license_expiry_reminders()
 
-		# Verify no email was sent
-		mock_sendmail.assert_not_called()
-
-	def test_already_sent_recently_with_recent_communication(self):
-		"""Test already_sent_recently with recent communication."""
-		# Create a recent communication
-		recent_comm = frappe.get_doc(
-			{
-				"doctype": "Communication",
-				"communication_type": "Automated Message",
-				"subject": "Recent Test Message",
-				"reference_doctype": "Customer",
-				"reference_name": "Test Customer Recent",
-				"content": "Recent test content",
-				"sent_or_received": "Sent",
-			}
-		)
-		recent_comm.insert()
-
-		result = already_sent_recently("Test Customer Recent", 15)
-		self.assertTrue(result)
-
-	def test_log_communication_fields(self):
-		"""Test that log_communication creates correct fields."""
-		log_communication("Test Customer Fields", "Test Subject Fields")
-
-		comm = frappe.get_last_doc(
-			"Communication",
-			filters={
-				"reference_doctype": "Customer",
-				"reference_name": "Test Customer Fields",
-			},
-		)
-
-		self.assertEqual(comm.communication_type, "Automated Message")
-		self.assertEqual(comm.subject, "Test Subject Fields")
-		self.assertEqual(comm.reference_doctype, "Customer")
-		self.assertEqual(comm.reference_name, "Test Customer Fields")
-		self.assertEqual(comm.sent_or_received, "Sent")
+		# Verify no email was queued or sent
+		mock_queue_emails.assert_not_called()
+		mock_deliver_reminders.assert_not_called()
+
+	def record_reminder(self, customer, license_number, expiry_date, sent_on=None):
+		record_reminders(
+			[frappe._dict(reference_name=customer, licenses=[("Drug License", license_number, expiry_date)])],
+			sent_on=sent_on,
+		)
+
+	def test_get_reminded_licenses(self):
+		"""Test that the ledger set holds only licences reminded within the interval."""
+		expiry_date = getdate(add_days(today(), 10))
+		self.record_reminder("Test Customer Notified", "DL-RECENT", expiry_date)
+		self.record_reminder(
+			"Test Customer Notified", "DL-OLD", expiry_date, sent_on=getdate(add_days(today(), -20))
+		)
+
+		result = get_reminded_licenses(15, customers=["Test Customer Notified", "Test Customer Silent"])
+		self.assertEqual(result, {("Test Customer Notified", "Drug License", "DL-RECENT", expiry_date)})
+
+	def test_record_reminders_updates_existing_entry(self):
+		"""Test that reminding a licence again moves its ledger entry instead of adding one."""
+		expiry_date = getdate(add_days(today(), 10))
+		self.record_reminder(
+			"Test Customer Ledger", "DL-1", expiry_date, sent_on=getdate(add_days(today(), -20))
+		)
+		self.record_reminder("Test Customer Ledger", "DL-1", expiry_date)
+
+		entries = frappe.get_all(
+			"Reminder Ledger", filters={"customer": "Test Customer Ledger"}, pluck="last_sent_on"
+		)
+		self.assertEqual(entries, [getdate()])
+
+	def test_get_reminder_plan(self):
+		"""Test that the plan holds only due, unreminded licences of enabled customers with an email."""
+		due = getdate(add_days(today(), 10))
+		later = getdate(add_days(today(), 90))
+		make_customer(
+			"Test Customer Plan Due",
+			dl=[("DL-PLAN-DUE", due)],
+			fssai=[("FS-PLAN-LATER", later)],
+			email_id="plan-due@example.com",
+		)
+		make_customer("Test Customer Plan Later", dl=[("DL-PLAN-LATER", later)], email_id="later@example.com")
+		make_customer(
+			"Test Customer Plan Disabled", dl=[("DL-PLAN-OFF", due)], email_id="off@example.com", disabled=1
+		)
+		make_customer("Test Customer Plan No Email", fssai=[("FS-PLAN-NO-EMAIL", due)])
+		make_customer(
+			"Test Customer Plan Reminded", dl=[("DL-PLAN-REMINDED", due)], email_id="reminded@example.com"
+		)
+		self.record_reminder("Test Customer Plan Reminded", "DL-PLAN-REMINDED", due)
+
+		plan, skipped = get_reminder_plan(getdate(today()), getdate(add_days(today(), 30)), 15)
+
+		plan = {
+			customer.name: customer for customer in plan if customer.name.startswith("Test Customer Plan")
+		}
+		self.assertEqual(list(plan), ["Test Customer Plan Due"])
+		self.assertEqual(plan["Test Customer Plan Due"].email_id, "plan-due@example.com")
+		self.assertEqual(
+			[row.license_number for row in plan["Test Customer Plan Due"].dl_details], ["DL-PLAN-DUE"]
+		)
+		self.assertEqual(plan["Test Customer Plan Due"].fssai_details, [])
+		self.assertGreaterEqual(skipped["no_email"], 1)
+		self.assertGreaterEqual(skipped["recently_sent"], 1)
+
+	def test_get_reminded_licenses_no_customers(self):
+		"""Test that an empty customer list matches nothing."""
+		self.assertEqual(get_reminded_licenses(15, customers=[]), set())
+
+	def make_run_log(self, total_chunks):
+		skipped = {"no_expiring_licenses": 3, "no_email": 0, "recently_sent": 0}
+		return start_run(now_datetime(), total_chunks, skipped, {"licence_lookup": 0.5}, 4)
+
+	def test_run_log_closed_by_last_chunk(self):
+		"""Test that chunks add up into the run log and the last one completes it."""
+		run_log = self.make_run_log(2)
+		counters = {"emails_sent": 1, "skipped_recently_sent": 1, "failed_renders": 0, "failed_sends": 0}
+
+		finish_chunk(run_log, counters, {"rendering": 0.25}, 2)
+		run = frappe.get_doc("Reminder Run Log", run_log)
+		self.assertEqual(run.status, "Running")
+		self.assertEqual(run.emails_sent, 1)
+		self.assertEqual(run.customers_skipped, 4)
+		self.assertEqual(frappe.db.get_single_value("Compliance Plus Settings", "last_reminder_run"), run_log)
+
+		finish_chunk(run_log, counters, {"rendering": 0.25}, 2)
+		run.reload()
+		self.assertEqual(run.status, "Completed")
+		self.assertEqual(run.emails_sent, 2)
+		self.assertEqual(run.skipped_recently_sent, 2)
+		self.assertEqual(run.query_count, 8)
+		self.assertAlmostEqual(run.rendering_time, 0.5)
+		self.assertTrue(run.finished_at)
+
+	def test_stale_runs_are_closed(self):
+		"""Test that a run whose chunks never report back is failed by the sweep."""
+		run_log = self.make_run_log(3)
+		counters = {"emails_sent": 1, "skipped_recently_sent": 0, "failed_renders": 0, "failed_sends": 0}
+		finish_chunk(run_log, counters, {}, 0)
+		frappe.db.set_value(
+			"Reminder Run Log", run_log, "started_at", add_to_date(now_datetime(), hours=-STALE_RUN_HOURS - 1)
+		)
+		fresh_run_log = self.make_run_log(1)
+
+		close_stale_runs()
+
+		run = frappe.get_doc("Reminder Run Log", run_log)
+		self.assertEqual(run.status, "Failed")
+		self.assertEqual(run.failed_chunks, 2)
+		self.assertEqual(run.pending_chunks, 0)
+		self.assertTrue(run.finished_at)
+		self.assertEqual(frappe.db.get_value("Reminder Run Log", fresh_run_log, "status"), "Running")
+
+	def test_successful_run_advances_watermark(self):
+		"""Test that a completed full run moves the watermark and the last full sweep."""
+		run_log = self.make_run_log(1)
+		counters = {"emails_sent": 0, "skipped_recently_sent": 0, "failed_renders": 0, "failed_sends": 0}
+
+		finish_chunk(run_log, counters, {}, 0)
+
+		started_at = frappe.db.get_value("Reminder Run Log", run_log, "started_at")
+		settings = frappe.get_single("Compliance Plus Settings")
+		self.assertEqual(get_datetime(settings.reminder_watermark), get_datetime(started_at))
+		self.assertEqual(getdate(settings.last_full_sweep), getdate(started_at))
+
+	def test_failed_sends_keep_watermark(self):
+		"""Test that a run with failed renders or sends does not move the watermark."""
+		frappe.db.set_single_value("Compliance Plus Settings", "reminder_watermark", None)
+		run_log = self.make_run_log(1)
+		counters = {"emails_sent": 3, "skipped_recently_sent": 0, "failed_renders": 0, "failed_sends": 1}
+
+		finish_chunk(run_log, counters, {}, 0)
+
+		self.assertEqual(frappe.db.get_value("Reminder Run Log", run_log, "status"), "Completed")
+		self.assertIsNone(frappe.db.get_single_value("Compliance Plus Settings", "reminder_watermark"))
+
+	def test_incremental_watermark(self):
+		"""Test that incremental runs fall back to a full sweep when one is due."""
+		today_date = getdate()
+		settings = frappe._dict(
+			incremental_reminders=1,
+			reminder_watermark=now_datetime(),
+			last_full_sweep=add_days(today_date, -2),
+			full_sweep_interval=7,
+		)
+		self.assertEqual(
+			get_incremental_watermark(settings, today_date), get_datetime(settings.reminder_watermark)
+		)
+
+		self.assertIsNone(
+			get_incremental_watermark(
+				frappe._dict(settings, last_full_sweep=add_days(today_date, -7)), today_date
+			)
+		)
+		self.assertIsNone(
+			get_incremental_watermark(frappe._dict(settings, incremental_reminders=0), today_date)
+		)
+		self.assertIsNone(
+			get_incremental_watermark(frappe._dict(settings, reminder_watermark=None), today_date)
+		)
+
+	def test_changed_customers_include_repeat_reminders(self):
+		"""Test that licences due a repeat reminder bring their customer into an incremental run."""
+		expiry_date = getdate(add_days(today(), 10))
+		self.record_reminder(
+			"Test Customer Repeat", "DL-REPEAT", expiry_date, sent_on=getdate(add_days(today(), -20))
+		)
+		self.record_reminder("Test Customer Fresh", "DL-FRESH", expiry_date)
+
+		changed = get_changed_customers(now_datetime(), getdate(), getdate(add_days(today(), 30)), 15)
+
+		self.assertIn("Test Customer Repeat", changed)
+		self.assertNotIn("Test Customer Fresh", changed)
+
+	def test_run_log_failed_chunk(self):
+		"""Test that a failing chunk marks the run as failed."""
+		run_log = self.make_run_log(1)
+		counters = {"emails_sent": 0, "skipped_recently_sent": 0, "failed_renders": 0, "failed_sends": 0}
+
+		finish_chunk(run_log, counters, {}, 0, failed=True)
+
+		self.assertEqual(frappe.db.get_value("Reminder Run Log", run_log, "status"), "Failed")
+
+	def test_schedule_pipeline_hands_late_slots_to_the_queue(self):
+		"""Test that pipeline customers whose slot is too far out get a send_after instead of a delay."""
+		now = now_datetime()
+		late = add_to_date(now, seconds=MAX_PIPELINE_WAIT + 60)
+		customers = [frappe._dict(name="Test Customer Now"), frappe._dict(name="Test Customer Late")]
+
+		with (
+			patch(
+				"compliance_plus.compliance_plus.custom.license_tracker_cron.now_datetime", return_value=now
+			),
+			patch(
+				"compliance_plus.compliance_plus.custom.license_tracker_cron.get_send_times",
+				return_value=[now, late],
+			),
+		):
+			pipelined, paced = schedule_pipeline(customers)
+
+		self.assertEqual([customer.name for customer in pipelined], ["Test Customer Now"])
+		self.assertEqual(pipelined[0].delay, 0)
+		self.assertEqual([customer.name for customer in paced], ["Test Customer Late"])
+		self.assertEqual(paced[0].send_after, late)
+
+	@patch("compliance_plus.compliance_plus.custom.license_tracker_cron.queue_emails")
+	def test_process_reminder_chunk_skips_recently_notified(self, mock_queue_emails):
+		"""Test that a chunk never re-sends a licence reminded in the interval."""
+		expiry_date = getdate(add_days(today(), 10))
+		self.record_reminder("Test Customer Chunk", "DL-CHUNK", expiry_date)
+		customer = frappe._dict(
+			name="Test Customer Chunk",
+			customer_name="Test Customer Chunk",
+			email_id="chunk@example.com",
+			dl_details=[frappe._dict(license_number="DL-CHUNK", expiry_date=expiry_date)],
+			fssai_details=[],
+		)
+		if not frappe.db.exists("Email Template", "Test License Reminder"):
+			frappe.get_doc(
+				{
+					"doctype": "Email Template",
+					"name": "Test License Reminder",
+					"subject": "Licence expiry",
+					"response": "Dear {{ doc.customer_name }}",
+				}
+			).insert()
+
+		run_log = self.make_run_log(1)
+		process_reminder_chunk(run_log, [customer], "sender@example.com", "Test License Reminder", 15)
+
+		mock_queue_emails.assert_not_called()
+		self.assertEqual(frappe.db.get_value("Reminder Run Log", run_log, "skipped_recently_sent"), 1)
+
+	def test_compiled_template_reused_until_modified(self):
+		"""Test that templates are compiled once per modified timestamp."""
+		template = frappe._dict(
+			name="Test Cached Template", modified="2025-01-01", response="Hi {{ doc.name }}"
+		)
+
+		compiled = get_compiled_template(template)
+		self.assertIs(get_compiled_template(template), compiled)
+		self.assertEqual(compiled.render({"doc": {"name": "A"}}), "Hi A")
+
+		template.modified = "2025-01-02"
+		template.response = "Hello {{ doc.name }}"
+		self.assertEqual(get_compiled_template(template).render({"doc": {"name": "A"}}), "Hello A")
+
+		evict_compiled_template(template)
+		self.assertIsNot(get_compiled_template(template), compiled)
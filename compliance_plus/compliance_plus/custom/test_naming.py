@@ -0,0 +1,64 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from compliance_plus.compliance_plus.custom.naming import merge_block_counters, reserve_block
+
+
+class TestNaming(FrappeTestCase):
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.clear_document_cache("Compliance Plus Settings", "Compliance Plus Settings")
+
+	def set_block_naming(self, enabled, size=3):
+		frappe.db.set_single_value(
+			"Compliance Plus Settings", {"block_naming": enabled, "naming_block_size": size}
+		)
+		frappe.clear_document_cache("Compliance Plus Settings", "Compliance Plus Settings")
+
+	def make_tracker(self, doctype, name):
+		return frappe.get_doc(
+			{
+				"doctype": doctype,
+				"document_name": name,
+				"issuer_supplier": "Test Authority",
+				"issue_date": add_days(getdate(), -400),
+				"expiry_date": add_days(getdate(), 100),
+				"status": "Active",
+			}
+		).insert()
+
+	def test_separate_counter_starts_after_shared_counter(self):
+		"""Test that a separate counter is seeded from the shared one."""
+		frappe.db.sql("insert into `tabSeries` (`name`, `current`) values ('TEST-NAMING-', 7)")
+
+		self.assertEqual(reserve_block("TEST-NAMING-|Hearing Tracker", 5, "TEST-NAMING-"), 8)
+		self.assertEqual(reserve_block("TEST-NAMING-|Hearing Tracker", 5, "TEST-NAMING-"), 13)
+
+	def test_merge_block_counters(self):
+		"""Test that turning block naming off moves the shared counter past the separate ones."""
+		frappe.db.sql(
+			"insert into `tabSeries` (`name`, `current`) values ('TEST-MERGE-', 4), ('TEST-MERGE-|Insurance Tracker', 20)"
+		)
+
+		merge_block_counters()
+
+		self.assertEqual(
+			frappe.db.sql("select `current` from `tabSeries` where `name` = 'TEST-MERGE-'")[0][0], 20
+		)
+
+	def test_block_naming_is_consecutive_within_a_block(self):
+		"""Test that trackers named from a block get consecutive numbers per doctype."""
+		self.set_block_naming(1)
+
+		first = self.make_tracker("Hearing Tracker", "Test Naming Hearing 1")
+		second = self.make_tracker("Hearing Tracker", "Test Naming Hearing 2")
+		insurance = self.make_tracker("Insurance Tracker", "Test Naming Insurance")
+
+		prefix, number = first.name.rsplit("-", 1)
+		self.assertEqual(second.name, f"{prefix}-{int(number) + 1:04d}")
+		self.assertTrue(insurance.name.startswith("INT-"))
@@ -0,0 +1,127 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from compliance_plus.compliance_plus.custom.bulk_mail import insert_communications
+from compliance_plus.compliance_plus.custom.tracker_reminders import (
+	get_digest_message,
+	get_due_trackers,
+	get_reminder_message,
+)
+
+
+class TestTrackerReminders(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.db.delete("Licence Tracker", {"document_name": ["like", "Test Reminder%"]})
+		frappe.db.delete("Trademark Tracker", {"document_name": ["like", "Test Reminder%"]})
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+	def make_licence(self, name, days_to_expiry, remind_before_days=10, enable_reminder=1):
+		return frappe.get_doc(
+			{
+				"doctype": "Licence Tracker",
+				"document_name": name,
+				"issuer_supplier": "Test Authority",
+				"issue_date": add_days(today(), -400),
+				"expiry_date": add_days(today(), days_to_expiry),
+				"status": "Active",
+				"in_charge": "Administrator",
+				"enable_reminder": enable_reminder,
+				"remind_before_days": remind_before_days,
+			}
+		).insert()
+
+	def get_due_names(self):
+		return {
+			item.name
+			for item in get_due_trackers(frappe.utils.getdate())
+			if item.doctype == "Licence Tracker"
+		}
+
+	def test_due_within_window(self):
+		"""Test that only trackers inside their reminder window are due."""
+		due = self.make_licence("Test Reminder Due", 5)
+		later = self.make_licence("Test Reminder Later", 50)
+		disabled = self.make_licence("Test Reminder Disabled", 5, enable_reminder=0)
+
+		due_names = self.get_due_names()
+
+		self.assertIn(due.name, due_names)
+		self.assertNotIn(later.name, due_names)
+		self.assertNotIn(disabled.name, due_names)
+
+	def test_reminded_once_per_window(self):
+		"""Test that a tracker already reminded in this window is not due again."""
+		due = self.make_licence("Test Reminder Once", 5)
+		insert_communications(
+			[frappe._dict(reference_doctype="Licence Tracker", reference_name=due.name, subject="Reminder")]
+		)
+
+		self.assertNotIn(due.name, self.get_due_names())
+
+	def test_trademark_activity_deadline_is_due(self):
+		"""Test that a trademark is due for its activity deadline, reminded once about the soonest date."""
+		trademark = frappe.get_doc(
+			{
+				"doctype": "Trademark Tracker",
+				"document_name": "Test Reminder Trademark",
+				"issue_date": add_days(today(), -400),
+				"expiry_date": add_days(today(), 8),
+				"activity_deadline": add_days(today(), 4),
+				"status": "Registered",
+				"in_charge": "Administrator",
+				"enable_reminder": 1,
+				"remind_before_days": 10,
+			}
+		).insert()
+
+		due = [item for item in get_due_trackers(frappe.utils.getdate()) if item.name == trademark.name]
+
+		self.assertEqual(len(due), 1)
+		self.assertEqual(due[0].kind, "Activity Deadline")
+		self.assertEqual(str(due[0].due_date), add_days(today(), 4))
+
+	def test_document_name_is_escaped(self):
+		"""Test that document names cannot inject markup into reminder emails."""
+		item = frappe._dict(
+			doctype="Licence Tracker", name="LT-0001", document_name="<b>Test</b>", due_date=today()
+		)
+		reminder = get_reminder_message(item, "admin@example.com")
+
+		self.assertNotIn("<b>", reminder.message)
+		self.assertNotIn("<b>", get_digest_message([reminder], "admin@example.com").message)
+
+	def test_digest_message(self):
+		"""Test that a user's reminders are combined into one email, soonest due first."""
+		later = self.make_licence("Test Reminder Digest Later", 8)
+		sooner = self.make_licence("Test Reminder Digest Sooner", 3)
+		reminders = [
+			get_reminder_message(
+				frappe._dict(
+					doctype="Licence Tracker",
+					name=doc.name,
+					document_name=doc.document_name,
+					due_date=doc.expiry_date,
+				),
+				"admin@example.com",
+			)
+			for doc in (later, sooner)
+		]
+
+		message = get_digest_message(reminders, "admin@example.com")
+
+		self.assertEqual(message.recipients, ["admin@example.com"])
+		self.assertIn("2", message.subject)
+		self.assertEqual(
+			[reminder.reference_name for reminder in message.reminders], [sooner.name, later.name]
+		)
+		self.assertLess(
+			message.message.index(sooner.document_name), message.message.index(later.document_name)
+		)
@@ -0,0 +1,54 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from compliance_plus.compliance_plus.custom.tracker_status import update_tracker_statuses
+
+
+class TestTrackerStatus(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.db.delete("Licence Tracker", {"document_name": ["like", "Test Status%"]})
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+
+	def make_licence(self, name, expiry_date, status="Active", remind_before_days=0):
+		return frappe.get_doc(
+			{
+				"doctype": "Licence Tracker",
+				"document_name": name,
+				"issuer_supplier": "Test Authority",
+				"issue_date": add_days(today(), -400),
+				"expiry_date": expiry_date,
+				"status": status,
+				"enable_reminder": 1 if remind_before_days else 0,
+				"remind_before_days": remind_before_days,
+			}
+		).insert()
+
+	def test_status_derived_from_expiry_date(self):
+		"""Test that statuses follow the expiry date and reminder window."""
+		expired = self.make_licence("Test Status Expired", add_days(today(), -1))
+		expiring = self.make_licence("Test Status Expiring", add_days(today(), 5), remind_before_days=10)
+		active = self.make_licence(
+			"Test Status Active", add_days(today(), 50), "Expired", remind_before_days=10
+		)
+
+		update_tracker_statuses()
+
+		self.assertEqual(frappe.db.get_value("Licence Tracker", expired.name, "status"), "Expired")
+		self.assertEqual(frappe.db.get_value("Licence Tracker", expiring.name, "status"), "Expiring Soon")
+		self.assertEqual(frappe.db.get_value("Licence Tracker", active.name, "status"), "Active")
+
+	def test_renewing_left_alone(self):
+		"""Test that Renewing trackers are never overwritten."""
+		renewing = self.make_licence("Test Status Renewing", add_days(today(), -10), "Renewing")
+
+		update_tracker_statuses()
+
+		self.assertEqual(frappe.db.get_value("Licence Tracker", renewing.name, "status"), "Renewing")
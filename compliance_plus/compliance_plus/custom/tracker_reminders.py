@@ -0,0 +1,156 @@
+import logging
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, escape_html, get_datetime, get_url_to_form, getdate
+
+from compliance_plus.compliance_plus.custom.bulk_mail import insert_communications, queue_emails
+from compliance_plus.compliance_plus.custom.expiry_index import TRACKER_SOURCES
+
+logger = logging.getLogger(__name__)
+
+# tracker doctype -> [(date field, kind)] reminders are counted back from, the same dates
+# the expiry index lists as due
+REMINDER_TRACKERS = TRACKER_SOURCES
+
+
+def send_tracker_reminders():
+	"""Email the `in_charge` user of every tracker whose reminder window has opened.
+
+	Each document is reminded once per window: the window opens `remind_before_days`
+	before its due date, and a document already reminded since then is skipped. In
+	digest mode each user gets a single email listing all of their due trackers.
+	"""
+	today = getdate()
+	sender = frappe.db.get_single_value("Compliance Plus Settings", "sender")
+	if not sender:
+		frappe.log_error("Sender not configured.", "Tracker Reminder Configuration Error")
+		logger.error("Sender not configured in Compliance Plus Settings")
+		return
+
+	digest = frappe.db.get_single_value("Compliance Plus Settings", "tracker_reminder_digest")
+	due_items = get_due_trackers(today)
+	if not due_items:
+		return
+
+	emails = dict(
+		frappe.get_all(
+			"User",
+			filters={"name": ["in", list({item.in_charge for item in due_items})], "enabled": 1},
+			fields=["name", "email"],
+			as_list=True,
+		)
+	)
+
+	reminders = {}
+	for item in due_items:
+		if not emails.get(item.in_charge):
+			logger.info(f"Skipped {item.doctype} {item.name}: In charge user has no email")
+			continue
+		reminders.setdefault(item.in_charge, []).append(get_reminder_message(item, emails[item.in_charge]))
+
+	if not reminders:
+		return
+
+	if digest:
+		outgoing = [get_digest_message(messages, emails[user]) for user, messages in reminders.items()]
+		queued = queue_emails(outgoing, sender)
+		# one Communication per tracker keeps the once-per-window check working
+		insert_communications([reminder for message in queued for reminder in message.reminders])
+	else:
+		queued = queue_emails([message for messages in reminders.values() for message in messages], sender)
+		insert_communications(queued)
+	logger.info(f"Tracker reminder cron completed: {len(queued)} emails sent")
+
+
+def get_due_trackers(today):
+	"""Return the trackers due for a reminder today, one query per doctype plus one dedup query each.
+
+	A tracker with several due dates in its window is reminded once, about the soonest.
+	"""
+	due_items = []
+	for doctype, date_fields in REMINDER_TRACKERS.items():
+		query = " union all ".join(
+			f"""
+			select name, document_name, in_charge, remind_before_days, `{date_field}` as due_date,
+				{frappe.db.escape(kind)} as kind
+			from `tab{doctype}`
+			where enable_reminder = 1
+				and ifnull(in_charge, '') != ''
+				and status != 'Renewing'
+				and `{date_field}` >= %(today)s
+				and datediff(`{date_field}`, %(today)s) <= remind_before_days
+			"""
+			for date_field, kind in date_fields
+		)
+		rows = {}
+		for row in frappe.db.sql(f"{query} order by due_date", {"today": today}, as_dict=True):
+			rows.setdefault(row.name, row)
+		if not rows:
+			continue
+
+		last_reminded = get_last_reminded(doctype, list(rows))
+		for row in rows.values():
+			window_start = add_days(row.due_date, -int(row.remind_before_days or 0))
+			if row.name in last_reminded and getdate(last_reminded[row.name]) >= window_start:
+				continue
+			row.doctype = doctype
+			due_items.append(row)
+
+	return due_items
+
+
+def get_last_reminded(doctype, names):
+	"""Return name -> latest Automated Message creation for the given documents."""
+	return {
+		row.reference_name: get_datetime(row.last_reminded)
+		for row in frappe.get_all(
+			"Communication",
+			filters={
+				"reference_doctype": doctype,
+				"reference_name": ["in", names],
+				"communication_type": "Automated Message",
+			},
+			fields=["reference_name", "max(creation) as last_reminded"],
+			group_by="reference_name",
+		)
+	}
+
+
+def get_reminder_message(item, email):
+	subject = _("{0} {1} is due on {2}").format(
+		_(item.doctype), item.document_name, frappe.format(item.due_date, "Date")
+	)
+	return frappe._dict(
+		reference_doctype=item.doctype,
+		reference_name=item.name,
+		document_name=item.document_name,
+		due_date=item.due_date,
+		recipients=[email],
+		subject=subject,
+		message=_("{0} <a href='{1}'>{2}</a> is due on {3}. Please review it before it lapses.").format(
+			_(item.doctype),
+			get_url_to_form(item.doctype, item.name),
+			escape_html(item.document_name),
+			frappe.format(item.due_date, "Date"),
+		),
+	)
+
+
+def get_digest_message(reminders, email):
+	"""Combine one user's tracker reminders into a single email, soonest due first."""
+	reminders = sorted(reminders, key=lambda reminder: reminder.due_date)
+	rows = "".join(
+		f"<tr><td>{_(reminder.reference_doctype)}</td>"
+		f"<td><a href='{get_url_to_form(reminder.reference_doctype, reminder.reference_name)}'>"
+		f"{escape_html(reminder.document_name)}</a></td>"
+		f"<td>{frappe.format(reminder.due_date, 'Date')}</td></tr>"
+		for reminder in reminders
+	)
+	return frappe._dict(
+		recipients=[email],
+		subject=_("{0} trackers are due for review").format(len(reminders)),
+		message=_("The following trackers are due. Please review them before they lapse.")
+		+ f"<table><tr><th>{_('Tracker')}</th><th>{_('Document')}</th><th>{_('Due On')}</th></tr>{rows}</table>",
+		reminders=reminders,
+	)
@@ -0,0 +1,67 @@
+import logging
+
+import frappe
+from frappe.utils import getdate
+
+from compliance_plus.compliance_plus.custom.expiry_index import refresh_tracker_statuses
+from compliance_plus.compliance_plus.custom.renewal_projection import clear_projection_cache
+
+logger = logging.getLogger(__name__)
+
+# tracker doctype -> date field its status is derived from
+STATUS_TRACKERS = {
+	"Licence Tracker": "expiry_date",
+	"Compliance Tracker": "expiry_date",
+	"Insurance Tracker": "expiry_date",
+	"Hearing Tracker": "expiry_date",
+	"Subscription Tracker": "end_date",
+}
+
+
+def update_tracker_statuses():
+	"""Recompute Active / Expiring Soon / Expired for every tracker from its dates.
+
+	Runs a few set-based UPDATEs per doctype that only touch rows whose status actually
+	changes. Trackers marked Renewing are left alone.
+	"""
+	default_days = frappe.db.get_single_value("Compliance Plus Settings", "expiry_threshold") or 15
+	today = getdate()
+
+	for doctype, date_field in STATUS_TRACKERS.items():
+		update_status(doctype, date_field, today, default_days)
+
+	refresh_tracker_statuses()
+
+	# imported here: the dashboard module reads STATUS_TRACKERS from this one
+	from compliance_plus.compliance_plus.custom.dashboard import clear_dashboard_cache
+
+	clear_dashboard_cache()
+	# projections leave out Expired subscriptions, so they change with the statuses
+	clear_projection_cache()
+
+
+def update_status(doctype, date_field, today, default_days, names=None):
+	"""Pass `names` to only update those trackers, e.g. after a bulk import that skipped doc_events."""
+	values = {"today": today, "default_days": default_days, "names": names}
+	days_left = f"datediff(`{date_field}`, %(today)s)"
+	window = "coalesce(nullif(remind_before_days, 0), %(default_days)s)"
+
+	conditions = {
+		"Expired": f"`{date_field}` < %(today)s",
+		"Expiring Soon": f"`{date_field}` >= %(today)s and {days_left} <= {window}",
+		"Active": f"{days_left} > {window}",
+	}
+
+	for status, condition in conditions.items():
+		frappe.db.sql(
+			f"""
+			update `tab{doctype}`
+			set status = %(status)s
+			where {condition}
+				and status not in (%(status)s, 'Renewing')
+				{"and name in %(names)s" if names else ""}
+			""",
+			dict(values, status=status),
+		)
+
+	logger.info(f"Tracker statuses updated for {doctype}")
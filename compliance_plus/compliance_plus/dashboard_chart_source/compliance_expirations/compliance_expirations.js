@@ -0,0 +1,9 @@
+// Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+// For license information, please see license.txt
+
+frappe.provide("frappe.dashboards.chart_sources");
+
+frappe.dashboards.chart_sources["Compliance Expirations"] = {
+	method: "compliance_plus.compliance_plus.dashboard_chart_source.compliance_expirations.compliance_expirations.get",
+	filters: [],
+};
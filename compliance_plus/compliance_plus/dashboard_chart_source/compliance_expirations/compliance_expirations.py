@@ -0,0 +1,25 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from compliance_plus.compliance_plus.custom.dashboard import get_summary
+
+
+@frappe.whitelist()
+def get(
+	chart_name=None,
+	chart=None,
+	no_cache=None,
+	filters=None,
+	from_date=None,
+	to_date=None,
+	timespan=None,
+	time_interval=None,
+	heatmap_year=None,
+):
+	weeks = get_summary().expirations_per_week
+	return {
+		"labels": [week["label"] for week in weeks],
+		"datasets": [{"name": "Expirations", "values": [week["total"] for week in weeks]}],
+	}
@@ -0,0 +1,8 @@
+// Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Compliance Expiry Index", {
+// 	refresh(frm) {
+
+// 	},
+// });
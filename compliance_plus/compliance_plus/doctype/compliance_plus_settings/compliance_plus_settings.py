@@ -1,9 +1,31 @@
 # Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from compliance_plus.compliance_plus.custom.naming import merge_block_counters
+
 
 class CompliancePlusSettings(Document):
-	pass
+	def on_update(self):
+		self.toggle_prepared_report()
+		if self.has_value_changed("block_naming") and not self.block_naming:
+			merge_block_counters()
+
+	def toggle_prepared_report(self):
+		apply_prepared_report_setting(self.prepared_license_tracker_report)
+
+
+def apply_prepared_report_setting(prepared=None):
+	"""Switch License Tracker Report between live and prepared (background) mode.
+
+	The report is standard, so `bench migrate` resets it from its JSON. This runs again after
+	every migrate to put the setting back.
+	"""
+	if not frappe.db.exists("Report", "License Tracker Report"):
+		return
+
+	if prepared is None:
+		prepared = frappe.db.get_single_value("Compliance Plus Settings", "prepared_license_tracker_report")
+	frappe.db.set_value("Report", "License Tracker Report", "prepared_report", prepared or 0)
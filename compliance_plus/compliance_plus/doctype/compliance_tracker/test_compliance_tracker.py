@@ -3,7 +3,7 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today, add_days
+from frappe.utils import add_days, today
 
 
 class TestComplianceTracker(FrappeTestCase):
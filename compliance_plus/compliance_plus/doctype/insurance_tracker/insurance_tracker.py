@@ -4,6 +4,9 @@
 # import frappe
 from frappe.model.document import Document
 
+from compliance_plus.compliance_plus.custom.naming import set_tracker_name
+
 
 class InsuranceTracker(Document):
-	pass
+	def autoname(self):
+		set_tracker_name(self)
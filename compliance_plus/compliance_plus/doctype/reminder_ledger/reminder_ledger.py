@@ -0,0 +1,13 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, getdate
+
+
+class ReminderLedger(Document):
+	@staticmethod
+	def clear_old_logs(days=365):
+		"""Entries for licences that expired long ago can never suppress a reminder again."""
+		frappe.db.delete("Reminder Ledger", {"expiry_date": ["<", add_days(getdate(), -days)]})
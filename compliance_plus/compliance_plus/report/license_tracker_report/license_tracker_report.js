@@ -26,7 +26,82 @@ frappe.query_reports["License Tracker Report"] = {
 			"label": "Expired",
 			"fieldtype": "Check",
 			"depends_on": "eval:!doc.expiry_in_30_days"
+		},
+		{
+			"fieldname": "paginate",
+			"label": "Load Page by Page",
+			"fieldtype": "Check"
+		}
+	],
+
+	onload: function(report) {
+		report.page.add_inner_button(__("Export"), function() {
+			frappe.prompt(
+				{
+					fieldname: "file_format",
+					label: __("File Format"),
+					fieldtype: "Select",
+					options: ["CSV", "Excel"],
+					default: "CSV",
+					reqd: 1
+				},
+				function(values) {
+					open_url_post(
+						"/api/method/compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.export_report",
+						{
+							filters: JSON.stringify(report.get_filter_values()),
+							file_format: values.file_format
+						}
+					);
+				},
+				__("Export Report"),
+				__("Export")
+			);
+		});
+	},
+
+	after_datatable_render: function(datatable) {
+		let report = frappe.query_report;
+		let filters = report.get_filter_values();
+		let rows = report.data || [];
+		let pagination = {
+			cursor: rows.length ? rows[rows.length - 1].customer : null,
+			loading: false
+		};
+		if (!filters.paginate || !pagination.cursor) {
+			return;
 		}
-	]
-}
 
+		let body = datatable.bodyScrollable;
+		// the datatable body can outlive a refresh, drop the handler bound by the previous one
+		$(body).off("scroll.cp_paginate");
+		$(body).on("scroll.cp_paginate", function() {
+			if (pagination.loading || !pagination.cursor) {
+				return;
+			}
+			if (body.scrollTop + body.clientHeight < body.scrollHeight - 200) {
+				return;
+			}
+
+			pagination.loading = true;
+			frappe.call({
+				method: "compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.get_page",
+				args: {
+					filters: filters,
+					after: pagination.cursor
+				},
+				callback: function(r) {
+					let page = r.message;
+					pagination.cursor = page.next_cursor;
+					if (page.rows.length) {
+						report.data.push(...page.rows);
+						datatable.appendRows(page.rows);
+					}
+				},
+				always: function() {
+					pagination.loading = false;
+				}
+			});
+		});
+	}
+}
\ No newline at end of file
@@ -84,84 +84,369 @@
 # Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
 # For license information, please see license.txt
 
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime, time, timedelta
+from itertools import groupby, islice
+
 import frappe
-from datetime import datetime, timedelta
+from frappe.utils import cint
+from openpyxl import Workbook
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+CACHE_KEY = "license_tracker_report"
+CACHE_FILTERS = ("customer", "customer_group", "expiry_in_30_days", "expired")
+PAGE_LENGTH = 100
+MAX_PAGE_LENGTH = 500
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FORMATS = {
+	"CSV": ("text/csv", "csv"),
+	"Excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
 
 def execute(filters=None):
+	filters = frappe._dict(filters or {})
 	today = datetime.today().date()
 	next_30 = today + timedelta(days=30)
 
-	columns = [
-		{"label": "Customer Name", "fieldname": "customer_name", "fieldtype": "Link", "options": "Customer", "width": 180},
-		{"label": "Customer Group", "fieldname": "customer_group", "fieldtype": "Link", "options": "Customer Group", "width": 150},
+	columns = get_columns()
+
+	if filters.get("paginate"):
+		page = get_license_page(filters, today, next_30)
+		report_summary = [
+			{"value": count_customers(filters, today, next_30), "label": "Customers", "datatype": "Int"}
+		]
+		return columns, page.rows, None, None, report_summary
+
+	cache_field = get_cache_field(filters, today)
+	data = frappe.cache().hget(CACHE_KEY, cache_field)
+	if data is None:
+		data = []
+		for _customer, rows in groupby(
+			get_license_rows(filters, today, next_30), key=lambda row: row.customer
+		):
+			data.extend(pair_license_rows(list(rows), filters, today, next_30))
+		frappe.cache().hset(CACHE_KEY, cache_field, data)
+		# only today's snapshots are ever read, so let the whole hash lapse at midnight
+		frappe.cache().expire(frappe.cache().make_key(CACHE_KEY), get_seconds_until_midnight())
+
+	return columns, data
+
+
+def get_columns():
+	return [
+		{
+			"label": "Customer Name",
+			"fieldname": "customer_name",
+			"fieldtype": "Link",
+			"options": "Customer",
+			"width": 180,
+		},
+		{
+			"label": "Customer Group",
+			"fieldname": "customer_group",
+			"fieldtype": "Link",
+			"options": "Customer Group",
+			"width": 150,
+		},
 		{"label": "DL Component", "fieldname": "dl_component", "fieldtype": "Data", "width": 150},
 		{"label": "DL License Number", "fieldname": "dl_license_number", "fieldtype": "Data", "width": 180},
 		{"label": "DL Expiry Date", "fieldname": "dl_expiry_date", "fieldtype": "Data", "width": 130},
 		{"label": "FSSAI Component", "fieldname": "fssai_component", "fieldtype": "Data", "width": 150},
-		{"label": "FSSAI License Number", "fieldname": "fssai_license_number", "fieldtype": "Data", "width": 180},
+		{
+			"label": "FSSAI License Number",
+			"fieldname": "fssai_license_number",
+			"fieldtype": "Data",
+			"width": 180,
+		},
 		{"label": "FSSAI Expiry Date", "fieldname": "fssai_expiry_date", "fieldtype": "Data", "width": 130},
 	]
 
-	customer_filters = {"disabled": 0}
-	if filters:
-		if filters.get("customer"):
-			customer_filters["name"] = filters["customer"]
-		if filters.get("customer_group"):
-			customer_filters["customer_group"] = filters["customer_group"]
-
-	customers = frappe.get_all("Customer", filters=customer_filters, fields=["name", "customer_name", "customer_group"])
-	data = []
-
-	for customer in customers:
-		dl_details = frappe.get_all("Drug License Details", filters={"parent": customer.name}, fields=["component", "license_number", "expiry_date"])
-		fssai_details = frappe.get_all("FSSAI Details", filters={"parent": customer.name}, fields=["component", "license_number", "expiry_date"])
-
-		max_rows = max(len(dl_details), len(fssai_details), 1)
-
-		for i in range(max_rows):
-			dl = dl_details[i] if i < len(dl_details) else {}
-			fssai = fssai_details[i] if i < len(fssai_details) else {}
 
-			dl_expiry = dl.get("expiry_date")
-			fssai_expiry = fssai.get("expiry_date")
-
-			show_row = True
-
-			if filters and (filters.get("expiry_in_30_days") or filters.get("expired")):
-				show_row = False
-				if filters.get("expiry_in_30_days"):
-					if (dl_expiry and today <= dl_expiry <= next_30) or (fssai_expiry and today <= fssai_expiry <= next_30):
-						show_row = True
-				if filters.get("expired"):
-					if (dl_expiry and dl_expiry < today) or (fssai_expiry and fssai_expiry < today):
-						show_row = True
-
-			if not show_row:
-				continue
-
-			dl_expiry_display = dl_expiry
-			if dl_expiry:
-				if dl_expiry < today:
-					dl_expiry_display = f'<span style="color:red">{dl_expiry}</span>'
-				elif today <= dl_expiry <= next_30:
-					dl_expiry_display = f'<span style="color:orange">{dl_expiry}</span>'
+@frappe.whitelist()
+def get_page(filters=None, after=None, page_length=PAGE_LENGTH):
+	"""Return the report rows of the next `page_length` customers after customer `after`."""
+	check_report_permission()
+	filters = frappe._dict(json.loads(filters) if isinstance(filters, str) else filters or {})
+	today = datetime.today().date()
+	next_30 = today + timedelta(days=30)
 
-			fssai_expiry_display = fssai_expiry
-			if fssai_expiry:
-				if fssai_expiry < today:
-					fssai_expiry_display = f'<span style="color:red">{fssai_expiry}</span>'
-				elif today <= fssai_expiry <= next_30:
-					fssai_expiry_display = f'<span style="color:orange">{fssai_expiry}</span>'
+	page_length = min(cint(page_length) or PAGE_LENGTH, MAX_PAGE_LENGTH)
+	return get_license_page(filters, today, next_30, after, page_length)
+
+
+def get_license_page(filters, today, next_30, after=None, page_length=PAGE_LENGTH):
+	"""Keyset-paginate on customer name, so every page costs the same however deep it is."""
+	values = {"today": today, "next_30": next_30, "page_length": page_length}
+	customer_conditions, _window_conditions = get_customer_conditions(filters, values)
+	if after:
+		customer_conditions.append("c.name > %(after)s")
+		values["after"] = after
+
+	customers = frappe.db.sql_list(
+		f"""
+		select c.name from `tabCustomer` c
+		where {" and ".join(customer_conditions)}
+		order by c.name
+		limit %(page_length)s
+		""",
+		values,
+	)
+
+	rows = []
+	if customers:
+		for _customer, license_rows in groupby(
+			get_license_rows(filters, today, next_30, customers=customers), key=lambda row: row.customer
+		):
+			rows.extend(pair_license_rows(list(license_rows), filters, today, next_30))
+
+	return frappe._dict(
+		rows=rows,
+		next_cursor=customers[-1] if len(customers) == page_length else None,
+	)
+
+
+def count_customers(filters, today, next_30):
+	values = {"today": today, "next_30": next_30}
+	customer_conditions, _window_conditions = get_customer_conditions(filters, values)
+	return frappe.db.sql(
+		f"select count(*) from `tabCustomer` c where {' and '.join(customer_conditions)}",
+		values,
+	)[0][0]
+
+
+def check_report_permission():
+	if not frappe.get_doc("Report", "License Tracker Report").is_permitted():
+		frappe.throw(frappe._("Not permitted to access this report"), frappe.PermissionError)
+
+
+def get_cache_field(filters, today):
+	"""Cache snapshots per filter set and day, so expiry colouring never goes stale."""
+	key_filters = {key: filters[key] for key in CACHE_FILTERS if filters.get(key)}
+	return f"{today}:{json.dumps(key_filters, sort_keys=True, default=str)}"
+
+
+def get_seconds_until_midnight():
+	now = datetime.now()
+	return int((datetime.combine(now.date() + timedelta(days=1), time.min) - now).total_seconds()) + 1
+
+
+def clear_report_cache(doc=None, method=None):
+	"""Drop every cached snapshot. Hooked to Customer and licence row changes."""
+	frappe.cache().delete_value(CACHE_KEY)
+
+
+def get_license_rows(filters, today, next_30, as_iterator=False, customers=None):
+	"""Fetch Drug License and FSSAI rows of matching customers in one UNION query.
+
+	Customers, customer groups and the expiry window are filtered in SQL. Rows come
+	back ordered by customer, so each customer's licences are contiguous. Pass
+	`as_iterator` inside `frappe.db.unbuffered_cursor()` to stream them, or a list of
+	`customers` to fetch a single page.
+	"""
+	values = {"today": today, "next_30": next_30}
+	customer_conditions, window_conditions = get_customer_conditions(filters, values)
+	if customers is not None:
+		customer_conditions.append("c.name in %(customers)s")
+		values["customers"] = customers or [""]
+
+	customer_conditions = " and ".join(customer_conditions)
+	without_licenses = ""
+	if not window_conditions:
+		# customers without any licence still get a single empty row
+		without_licenses = f"""
+			union all
+			select c.name as customer, c.customer_name, c.customer_group,
+				null as kind, null as component, null as license_number, null as expiry_date, null as modified
+			from `tabCustomer` c
+			where {customer_conditions}
+				and not exists (select 1 from `tabDrug License Details` d where d.parent = c.name)
+				and not exists (select 1 from `tabFSSAI Details` f where f.parent = c.name)
+		"""
+
+	return frappe.db.sql(
+		f"""
+		select c.name as customer, c.customer_name, c.customer_group,
+			'DL' as kind, d.component, d.license_number, d.expiry_date, d.modified
+		from `tabCustomer` c
+		inner join `tabDrug License Details` d on d.parent = c.name
+		where {customer_conditions}
+		union all
+		select c.name as customer, c.customer_name, c.customer_group,
+			'FSSAI' as kind, f.component, f.license_number, f.expiry_date, f.modified
+		from `tabCustomer` c
+		inner join `tabFSSAI Details` f on f.parent = c.name
+		where {customer_conditions}
+		{without_licenses}
+		order by customer, kind, modified desc
+		""",
+		values,
+		as_dict=True,
+		as_iterator=as_iterator,
+	)
+
+
+def get_customer_conditions(filters, values):
+	"""Return the Customer conditions for `filters` and the expiry window conditions they use."""
+	customer_conditions = ["c.disabled = 0"]
+	if filters.get("customer"):
+		customer_conditions.append("c.name = %(customer)s")
+		values["customer"] = filters.customer
+	if filters.get("customer_group"):
+		customer_conditions.append("c.customer_group = %(customer_group)s")
+		values["customer_group"] = filters.customer_group
+
+	window_conditions = []
+	if filters.get("expiry_in_30_days"):
+		window_conditions.append("expiry_date between %(today)s and %(next_30)s")
+	if filters.get("expired"):
+		window_conditions.append("expiry_date < %(today)s")
+
+	if window_conditions:
+		window = " or ".join(window_conditions)
+		customer_conditions.append(
+			f"""c.name in (
+				select parent from `tabDrug License Details` where {window}
+				union
+				select parent from `tabFSSAI Details` where {window}
+			)"""
+		)
+
+	return customer_conditions, window_conditions
+
+
+def pair_license_rows(rows, filters, today, next_30, plain=False):
+	"""Lay out one customer's DL and FSSAI licences side by side, one pair per row.
+
+	With `plain`, expiry dates are returned as dates, without the colour markup.
+	"""
+	format_date = (lambda expiry_date, *_args: expiry_date) if plain else format_expiry
+	dl_details = [row for row in rows if row.kind == "DL"]
+	fssai_details = [row for row in rows if row.kind == "FSSAI"]
+	customer = rows[0]
 
-			data.append({
+	data = []
+	max_rows = max(len(dl_details), len(fssai_details), 1)
+
+	for i in range(max_rows):
+		dl = dl_details[i] if i < len(dl_details) else {}
+		fssai = fssai_details[i] if i < len(fssai_details) else {}
+
+		dl_expiry = dl.get("expiry_date")
+		fssai_expiry = fssai.get("expiry_date")
+
+		show_row = True
+
+		if filters.get("expiry_in_30_days") or filters.get("expired"):
+			show_row = False
+			if filters.get("expiry_in_30_days"):
+				if (dl_expiry and today <= dl_expiry <= next_30) or (
+					fssai_expiry and today <= fssai_expiry <= next_30
+				):
+					show_row = True
+			if filters.get("expired"):
+				if (dl_expiry and dl_expiry < today) or (fssai_expiry and fssai_expiry < today):
+					show_row = True
+
+		if not show_row:
+			continue
+
+		data.append(
+			{
+				"customer": customer.customer,
 				"customer_name": customer.customer_name if i == 0 else "",
 				"customer_group": customer.customer_group if i == 0 else "",
-				"dl_component": dl.get("component", ""),
-				"dl_license_number": dl.get("license_number", ""),
-				"dl_expiry_date": dl_expiry_display or "",
-				"fssai_component": fssai.get("component", ""),
-				"fssai_license_number": fssai.get("license_number", ""),
-				"fssai_expiry_date": fssai_expiry_display or "",
-			})
-
-	return columns, data
+				"dl_component": dl.get("component") or "",
+				"dl_license_number": dl.get("license_number") or "",
+				"dl_expiry_date": format_date(dl_expiry, today, next_30) or "",
+				"fssai_component": fssai.get("component") or "",
+				"fssai_license_number": fssai.get("license_number") or "",
+				"fssai_expiry_date": format_date(fssai_expiry, today, next_30) or "",
+			}
+		)
+
+	return data
+
+
+def format_expiry(expiry_date, today, next_30):
+	if not expiry_date:
+		return expiry_date
+	if expiry_date < today:
+		return f'<span style="color:red">{expiry_date}</span>'
+	if expiry_date <= next_30:
+		return f'<span style="color:orange">{expiry_date}</span>'
+	return expiry_date
+
+
+@frappe.whitelist()
+def export_report(filters=None, file_format="CSV"):
+	"""Export the report as CSV or Excel without building it in memory.
+
+	Rows are streamed from an unbuffered cursor in chunks, written to a temporary file
+	and sent from disk, so memory stays flat whatever the row count.
+	"""
+	check_report_permission()
+	if file_format not in EXPORT_FORMATS:
+		frappe.throw(frappe._("Unsupported export format: {0}").format(file_format))
+
+	filters = frappe._dict(json.loads(filters) if isinstance(filters, str) else filters or {})
+	mimetype, extension = EXPORT_FORMATS[file_format]
+
+	file = tempfile.TemporaryFile()
+	with frappe.db.unbuffered_cursor():
+		chunks = get_export_chunks(filters)
+		if file_format == "CSV":
+			write_csv(file, chunks)
+		else:
+			write_xlsx(file, chunks)
+	file.seek(0)
+
+	return Response(
+		wrap_file(frappe.local.request.environ, file),
+		mimetype=mimetype,
+		direct_passthrough=True,
+		headers={"Content-Disposition": f'attachment; filename="license_tracker_report.{extension}"'},
+	)
+
+
+def get_export_chunks(filters, chunk_size=EXPORT_CHUNK_SIZE):
+	"""Yield the export rows, as plain lists in column order, EXPORT_CHUNK_SIZE at a time."""
+	today = datetime.today().date()
+	next_30 = today + timedelta(days=30)
+	fieldnames = [column["fieldname"] for column in get_columns()]
+
+	rows = (
+		[row[fieldname] for fieldname in fieldnames]
+		for _customer, license_rows in groupby(
+			get_license_rows(filters, today, next_30, as_iterator=True), key=lambda row: row.customer
+		)
+		for row in pair_license_rows(list(license_rows), filters, today, next_30, plain=True)
+	)
+	while chunk := list(islice(rows, chunk_size)):
+		yield chunk
+
+
+def write_csv(file, chunks):
+	text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+	writer = csv.writer(text)
+	writer.writerow([column["label"] for column in get_columns()])
+	for chunk in chunks:
+		writer.writerows(chunk)
+	# leave the binary file open for the response
+	text.flush()
+	text.detach()
+
+
+def write_xlsx(file, chunks):
+	# a write-only workbook spools rows to disk instead of keeping cells in memory
+	workbook = Workbook(write_only=True)
+	sheet = workbook.create_sheet("License Tracker Report")
+	sheet.append([column["label"] for column in get_columns()])
+	for chunk in chunks:
+		for row in chunk:
+			sheet.append(row)
+	workbook.save(file)
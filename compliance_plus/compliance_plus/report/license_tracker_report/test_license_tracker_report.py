@@ -0,0 +1,271 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+import csv
+import io
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from compliance_plus.compliance_plus.custom.test_license_tracker_cron import delete_customers, make_customer
+from compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report import (
+	CACHE_KEY,
+	clear_report_cache,
+	execute,
+	format_expiry,
+	get_cache_field,
+	get_export_chunks,
+	get_license_page,
+	get_page,
+	pair_license_rows,
+	write_csv,
+)
+
+TODAY = date(2025, 7, 1)
+NEXT_30 = TODAY + timedelta(days=30)
+
+
+def license_row(kind, license_number, expiry_date):
+	return frappe._dict(
+		customer="Test Customer Report",
+		customer_name="Test Customer Report",
+		customer_group="Commercial",
+		kind=kind,
+		component=f"{kind} Component",
+		license_number=license_number,
+		expiry_date=expiry_date,
+	)
+
+
+def make_customer_group(name):
+	if not frappe.db.exists("Customer Group", name):
+		frappe.get_doc(
+			{
+				"doctype": "Customer Group",
+				"customer_group_name": name,
+				"parent_customer_group": "All Customer Groups",
+			}
+		).insert(ignore_permissions=True)
+	return name
+
+
+class TestLicenseTrackerReport(FrappeTestCase):
+	def setUp(self):
+		delete_customers("Test Customer Report%")
+		clear_report_cache()
+
+	def tearDown(self):
+		delete_customers("Test Customer Report%")
+		clear_report_cache()
+
+	def test_columns(self):
+		"""Test that the report returns the DL and FSSAI columns side by side."""
+		columns, _data = execute({"customer": "Test Customer Missing"})
+		fieldnames = [column["fieldname"] for column in columns]
+
+		self.assertEqual(fieldnames[0], "customer_name")
+		self.assertIn("dl_expiry_date", fieldnames)
+		self.assertIn("fssai_expiry_date", fieldnames)
+
+	def test_pair_license_rows(self):
+		"""Test that the i-th DL row is paired with the i-th FSSAI row."""
+		rows = [
+			license_row("DL", "DL-1", TODAY + timedelta(days=100)),
+			license_row("DL", "DL-2", TODAY + timedelta(days=200)),
+			license_row("FSSAI", "FS-1", TODAY + timedelta(days=300)),
+		]
+
+		data = pair_license_rows(rows, frappe._dict(), TODAY, NEXT_30)
+
+		self.assertEqual(len(data), 2)
+		self.assertEqual(data[0]["customer_name"], "Test Customer Report")
+		self.assertEqual(data[0]["dl_license_number"], "DL-1")
+		self.assertEqual(data[0]["fssai_license_number"], "FS-1")
+		self.assertEqual(data[1]["customer_name"], "")
+		self.assertEqual(data[1]["dl_license_number"], "DL-2")
+		self.assertEqual(data[1]["fssai_license_number"], "")
+
+	def test_pair_license_rows_without_licenses(self):
+		"""Test that a customer without licences still gets one empty row."""
+		rows = [license_row(None, None, None)]
+
+		data = pair_license_rows(rows, frappe._dict(), TODAY, NEXT_30)
+
+		self.assertEqual(len(data), 1)
+		self.assertEqual(data[0]["dl_license_number"], "")
+		self.assertEqual(data[0]["fssai_expiry_date"], "")
+
+	def test_pair_license_rows_expiry_filter(self):
+		"""Test that only pairs touching the expiry window are kept."""
+		rows = [
+			license_row("DL", "DL-1", TODAY + timedelta(days=10)),
+			license_row("DL", "DL-2", TODAY + timedelta(days=200)),
+		]
+
+		data = pair_license_rows(rows, frappe._dict(expiry_in_30_days=1), TODAY, NEXT_30)
+
+		self.assertEqual(len(data), 1)
+		self.assertEqual(data[0]["dl_license_number"], "DL-1")
+
+	def test_pair_license_rows_plain(self):
+		"""Test that plain rows keep expiry dates without colour markup."""
+		expired = TODAY - timedelta(days=1)
+		rows = [license_row("DL", "DL-1", expired)]
+
+		data = pair_license_rows(rows, frappe._dict(), TODAY, NEXT_30, plain=True)
+
+		self.assertEqual(data[0]["dl_expiry_date"], expired)
+
+	def test_export_chunks(self):
+		"""Test that export rows are streamed in chunks, in column order and without markup."""
+		rows = [license_row("DL", f"DL-{i}", date.today() - timedelta(days=1)) for i in range(5)]
+		with patch(
+			"compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.get_license_rows",
+			return_value=iter(rows),
+		):
+			chunks = list(get_export_chunks(frappe._dict(), chunk_size=2))
+
+		self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+		self.assertEqual(chunks[0][0][0], "Test Customer Report")
+		self.assertEqual(chunks[0][0][3], "DL-0")
+		self.assertEqual(chunks[0][0][4], date.today() - timedelta(days=1))
+
+		file = io.BytesIO()
+		write_csv(file, chunks)
+		lines = list(csv.reader(io.StringIO(file.getvalue().decode())))
+		self.assertEqual(lines[0][0], "Customer Name")
+		self.assertEqual(len(lines), 6)
+		self.assertNotIn("span", file.getvalue().decode())
+
+	def test_format_expiry(self):
+		"""Test expiry date colouring."""
+		self.assertIn("color:red", format_expiry(TODAY - timedelta(days=1), TODAY, NEXT_30))
+		self.assertIn("color:orange", format_expiry(TODAY + timedelta(days=5), TODAY, NEXT_30))
+		self.assertEqual(
+			format_expiry(TODAY + timedelta(days=60), TODAY, NEXT_30), TODAY + timedelta(days=60)
+		)
+		self.assertIsNone(format_expiry(None, TODAY, NEXT_30))
+
+	def test_cache_field_ignores_empty_filters(self):
+		"""Test that equivalent filter sets share a cache entry."""
+		self.assertEqual(
+			get_cache_field(frappe._dict(customer="A", expired=0), TODAY),
+			get_cache_field(frappe._dict(customer="A"), TODAY),
+		)
+		self.assertNotEqual(
+			get_cache_field(frappe._dict(customer="A"), TODAY),
+			get_cache_field(frappe._dict(customer="A"), NEXT_30),
+		)
+
+	def test_execute_uses_cached_snapshot(self):
+		"""Test that execute serves a cached snapshot until the cache is cleared."""
+		filters = frappe._dict(customer="Test Customer Cached")
+		field = get_cache_field(filters, date.today())
+		frappe.cache().hset(CACHE_KEY, field, [{"customer_name": "Cached Row"}])
+
+		_columns, data = execute(filters)
+		self.assertEqual(data, [{"customer_name": "Cached Row"}])
+
+		clear_report_cache()
+		_columns, data = execute(filters)
+		self.assertEqual(data, [])
+
+	def test_cached_snapshots_expire_at_midnight(self):
+		"""Test that the snapshot hash is given a TTL that ends by the next day."""
+		execute({"customer": "Test Customer Missing"})
+
+		ttl = frappe.cache().ttl(frappe.cache().make_key(CACHE_KEY))
+		self.assertGreater(ttl, 0)
+		self.assertLessEqual(ttl, 24 * 60 * 60 + 1)
+
+	def test_license_page_cursor(self):
+		"""Test that pages follow customer name order and end with an empty cursor."""
+		filters = frappe._dict(customer="Test Customer Missing")
+
+		page = get_license_page(filters, TODAY, NEXT_30, page_length=10)
+
+		self.assertEqual(page.rows, [])
+		self.assertIsNone(page.next_cursor)
+
+	def test_paginated_execute_returns_customer_count(self):
+		"""Test that paginated mode reports the customer total from a count query."""
+		result = execute({"customer": "Test Customer Missing", "paginate": 1})
+
+		self.assertEqual(result[1], [])
+		self.assertEqual(result[4][0]["value"], 0)
+
+	def test_execute_with_customers(self):
+		"""Test pairing and the expiry and customer group filters against real licence rows."""
+		group = make_customer_group("Test Report Group")
+		make_customer(
+			"Test Customer Report A",
+			dl=[("DL-REPORT-A", add_days(today(), 10))],
+			fssai=[("FS-REPORT-A", add_days(today(), -5))],
+			customer_group=group,
+		)
+		make_customer(
+			"Test Customer Report B", dl=[("DL-REPORT-B", add_days(today(), 90))], customer_group=group
+		)
+		make_customer(
+			"Test Customer Report C", fssai=[("FS-REPORT-C", add_days(today(), 20))], customer_group=group
+		)
+		make_customer(
+			"Test Customer Report Other",
+			dl=[("DL-REPORT-OTHER", add_days(today(), 10))],
+			customer_group=make_customer_group("Test Report Other Group"),
+		)
+
+		def get_rows(**filters):
+			_columns, data = execute(dict(customer_group=group, **filters))
+			return [(row["customer"], row["dl_license_number"], row["fssai_license_number"]) for row in data]
+
+		# rows follow customer name order, one DL and FSSAI licence per row
+		self.assertEqual(
+			get_rows(),
+			[
+				("Test Customer Report A", "DL-REPORT-A", "FS-REPORT-A"),
+				("Test Customer Report B", "DL-REPORT-B", ""),
+				("Test Customer Report C", "", "FS-REPORT-C"),
+			],
+		)
+		self.assertEqual(
+			get_rows(expiry_in_30_days=1),
+			[
+				("Test Customer Report A", "DL-REPORT-A", "FS-REPORT-A"),
+				("Test Customer Report C", "", "FS-REPORT-C"),
+			],
+		)
+		self.assertEqual(get_rows(expired=1), [("Test Customer Report A", "DL-REPORT-A", "FS-REPORT-A")])
+
+		_columns, data = execute({"customer_group": group})
+		self.assertIn("color:orange", data[0]["dl_expiry_date"])
+		self.assertIn("color:red", data[0]["fssai_expiry_date"])
+
+	def test_pages_walk_every_customer_once(self):
+		"""Test that following next_cursor visits each customer once, in name order."""
+		group = make_customer_group("Test Report Page Group")
+		customers = [
+			make_customer(
+				f"Test Customer Report Page {i}",
+				dl=[(f"DL-PAGE-{i}", add_days(today(), 10))],
+				customer_group=group,
+			)
+			for i in range(5)
+		]
+		filters = {"customer_group": group}
+
+		pages, after = [], None
+		while True:
+			page = get_page(filters, after=after, page_length=2)
+			pages.append([row["customer"] for row in page.rows])
+			after = page.next_cursor
+			if not after:
+				break
+			self.assertEqual(after, pages[-1][-1])
+
+		self.assertEqual([len(page) for page in pages], [2, 2, 1])
+		self.assertEqual([customer for page in pages for customer in page], sorted(customers))
+		self.assertEqual(execute(dict(filters, paginate=1))[4][0]["value"], 5)
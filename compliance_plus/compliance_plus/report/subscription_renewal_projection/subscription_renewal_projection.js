@@ -0,0 +1,32 @@
+// Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Subscription Renewal Projection"] = {
+	"filters": [
+		{
+			"fieldname": "from_date",
+			"label": "From Date",
+			"fieldtype": "Date",
+			"default": frappe.datetime.get_today(),
+			"reqd": 1
+		},
+		{
+			"fieldname": "months",
+			"label": "Months",
+			"fieldtype": "Select",
+			"options": ["12", "18", "24"],
+			"default": "12"
+		},
+		{
+			"fieldname": "in_charge",
+			"label": "In Charge",
+			"fieldtype": "Link",
+			"options": "User"
+		},
+		{
+			"fieldname": "include_expired",
+			"label": "Include Expired Subscriptions",
+			"fieldtype": "Check"
+		}
+	]
+};
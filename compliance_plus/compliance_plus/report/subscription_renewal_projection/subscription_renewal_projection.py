@@ -0,0 +1,59 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+
+from compliance_plus.compliance_plus.custom.renewal_projection import (
+	get_cached_projection,
+	get_projection_filters,
+)
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	projection = get_cached_projection(
+		get_projection_filters(filters.from_date, filters.months, filters.include_expired, filters.in_charge)
+	)
+
+	chart = {
+		"data": {
+			"labels": [row["month"] for row in projection.per_month],
+			"datasets": [{"name": "Renewals", "values": [row["renewals"] for row in projection.per_month]}],
+		},
+		"type": "bar",
+	}
+	report_summary = [
+		{"value": projection.total, "label": "Renewals", "datatype": "Int"},
+		{
+			"value": len({row.subscription for row in projection.renewals}),
+			"label": "Subscriptions",
+			"datatype": "Int",
+		},
+	]
+	return get_columns(), projection.renewals, None, chart, report_summary
+
+
+def get_columns():
+	return [
+		{"label": "Renewal Date", "fieldname": "renewal_date", "fieldtype": "Date", "width": 120},
+		{
+			"label": "Subscription",
+			"fieldname": "subscription",
+			"fieldtype": "Link",
+			"options": "Subscription Tracker",
+			"width": 160,
+		},
+		{"label": "Document Name", "fieldname": "document_name", "fieldtype": "Data", "width": 180},
+		{"label": "Type", "fieldname": "type", "fieldtype": "Data", "width": 120},
+		{"label": "Issuer / Supplier", "fieldname": "issuer_supplier", "fieldtype": "Data", "width": 160},
+		{"label": "Subscription Type", "fieldname": "subscription_type", "fieldtype": "Data", "width": 120},
+		{"label": "Status", "fieldname": "status", "fieldtype": "Data", "width": 110},
+		{
+			"label": "In Charge",
+			"fieldname": "in_charge",
+			"fieldtype": "Link",
+			"options": "User",
+			"width": 150,
+		},
+		{"label": "Current End Date", "fieldname": "end_date", "fieldtype": "Date", "width": 120},
+	]
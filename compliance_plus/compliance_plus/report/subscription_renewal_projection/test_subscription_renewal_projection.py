@@ -0,0 +1,93 @@
+# Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and Contributors
+# See license.txt
+
+from datetime import date
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from compliance_plus.compliance_plus.custom.renewal_projection import (
+	CACHE_KEY,
+	get_cached_projection,
+	get_projection_filters,
+)
+from compliance_plus.compliance_plus.report.subscription_renewal_projection.subscription_renewal_projection import (
+	execute,
+)
+
+
+class TestSubscriptionRenewalProjection(FrappeTestCase):
+	def setUp(self):
+		"""Set up test fixtures."""
+		frappe.db.delete("Subscription Tracker", {"document_name": ["like", "Test Projection%"]})
+		frappe.cache().delete_value(CACHE_KEY)
+
+	def tearDown(self):
+		"""Clean up after tests."""
+		frappe.db.rollback()
+		frappe.cache().delete_value(CACHE_KEY)
+
+	def make_subscription(self, name, end_date, subscription_type, status="Active"):
+		return frappe.get_doc(
+			{
+				"doctype": "Subscription Tracker",
+				"document_name": name,
+				"issuer_supplier": "Test Supplier",
+				"start_date": date(2019, 1, 1),
+				"end_date": end_date,
+				"subscription_type": subscription_type,
+				"status": status,
+				"in_charge": "Administrator",
+			}
+		).insert()
+
+	def get_renewals(self, subscription, from_date, months=12, include_expired=0):
+		projection = get_cached_projection(get_projection_filters(from_date, months, include_expired))
+		return [row.renewal_date for row in projection.renewals if row.subscription == subscription.name]
+
+	def test_monthly_renewals_clamp_to_month_end(self):
+		"""Test that monthly renewals are computed from the end date, so month ends do not drift."""
+		subscription = self.make_subscription("Test Projection Monthly", date(2030, 1, 31), "Monthly")
+
+		self.assertEqual(
+			self.get_renewals(subscription, "2030-01-01", months=3),
+			[date(2030, 1, 31), date(2030, 2, 28), date(2030, 3, 31)],
+		)
+
+	def test_old_yearly_subscription(self):
+		"""Test that renewals before the window are skipped, however old the end date."""
+		subscription = self.make_subscription("Test Projection Yearly", date(2020, 3, 15), "Yearly")
+
+		self.assertEqual(
+			self.get_renewals(subscription, "2030-01-01", months=24), [date(2030, 3, 15), date(2031, 3, 15)]
+		)
+
+	def test_expired_subscriptions_are_optional(self):
+		"""Test that Expired subscriptions are only projected when asked for."""
+		subscription = self.make_subscription(
+			"Test Projection Expired", date(2030, 2, 1), "Yearly", "Expired"
+		)
+
+		self.assertEqual(self.get_renewals(subscription, "2030-01-01"), [])
+		self.assertEqual(self.get_renewals(subscription, "2030-01-01", include_expired=1), [date(2030, 2, 1)])
+
+	def test_cache_follows_subscription_changes(self):
+		"""Test that a saved subscription invalidates the cached projection."""
+		subscription = self.make_subscription("Test Projection Cache", date(2030, 2, 1), "Yearly")
+		self.assertEqual(self.get_renewals(subscription, "2030-01-01"), [date(2030, 2, 1)])
+
+		subscription.end_date = date(2030, 5, 1)
+		subscription.save()
+
+		self.assertEqual(self.get_renewals(subscription, "2030-01-01"), [date(2030, 5, 1)])
+
+	def test_report(self):
+		"""Test that the report returns the renewals with a chart bar for every month."""
+		self.make_subscription("Test Projection Report", date(2030, 1, 10), "Monthly")
+
+		_columns, data, _message, chart, summary = execute({"from_date": "2030-01-01", "months": "12"})
+
+		self.assertEqual(len(chart["data"]["labels"]), 12)
+		self.assertEqual(chart["data"]["labels"][0], "2030-01")
+		self.assertGreaterEqual(summary[0]["value"], 12)
+		self.assertEqual(len([row for row in data if row.document_name == "Test Projection Report"]), 12)
@@ -48,6 +48,9 @@ required_apps = ["erpnext"]
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
 
+doctype_js = {"Customer": "public/js/customer.js"}
+doctype_list_js = {"Customer": "public/js/customer_list.js"}
+
 # Svg Icons
 # ------------------
 # include app icons in desk
@@ -83,7 +86,8 @@ required_apps = ["erpnext"]
 # ------------
 
 # before_install = "compliance_plus.install.before_install"
-# after_install = "compliance_plus.install.after_install"
+after_install = "compliance_plus.install.after_install"
+after_migrate = "compliance_plus.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -145,25 +149,123 @@ required_apps = ["erpnext"]
 # 	}
 # }
 
+doc_events = {
+	"Customer": {
+		"on_update": [
+			"compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.clear_report_cache",
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_customer_licenses",
+			"compliance_plus.compliance_plus.custom.license_health.refresh_customer_health",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.clear_report_cache",
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_customer_licenses",
+			"compliance_plus.compliance_plus.custom.license_health.remove_customer_health",
+		],
+		"after_rename": [
+			"compliance_plus.compliance_plus.report.license_tracker_report.license_tracker_report.clear_report_cache",
+			"compliance_plus.compliance_plus.custom.expiry_index.rename_customer",
+			"compliance_plus.compliance_plus.custom.license_health.rename_customer_health",
+		],
+	},
+	"Email Template": {
+		"on_update": "compliance_plus.compliance_plus.custom.license_tracker_cron.evict_compiled_template",
+		"on_trash": "compliance_plus.compliance_plus.custom.license_tracker_cron.evict_compiled_template",
+	},
+	"Licence Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"after_rename": "compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+	},
+	"Compliance Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"after_rename": "compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+	},
+	"Insurance Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"after_rename": "compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+	},
+	"Hearing Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"after_rename": "compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+	},
+	"Subscription Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+			"compliance_plus.compliance_plus.custom.renewal_projection.clear_projection_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+			"compliance_plus.compliance_plus.custom.renewal_projection.clear_projection_cache",
+		],
+		"after_rename": [
+			"compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+			"compliance_plus.compliance_plus.custom.renewal_projection.clear_projection_cache",
+		],
+	},
+	"Trademark Tracker": {
+		"on_update": [
+			"compliance_plus.compliance_plus.custom.expiry_index.sync_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"on_trash": [
+			"compliance_plus.compliance_plus.custom.expiry_index.remove_tracker",
+			"compliance_plus.compliance_plus.custom.dashboard.clear_dashboard_cache",
+		],
+		"after_rename": "compliance_plus.compliance_plus.custom.expiry_index.rename_tracker",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
 scheduler_events = {
-# 	"all": [
-# 		"compliance_plus.tasks.all"
-# 	],
+	# 	"all": [
+	# 		"compliance_plus.tasks.all"
+	# 	],
 	"daily": [
-		"compliance_plus.compliance_plus.custom.license_tracker_cron.send_license_expiry_reminders"
+		"compliance_plus.compliance_plus.custom.license_tracker_cron.send_license_expiry_reminders",
+		"compliance_plus.compliance_plus.custom.tracker_status.update_tracker_statuses",
+		"compliance_plus.compliance_plus.custom.tracker_reminders.send_tracker_reminders",
+		"compliance_plus.compliance_plus.custom.license_health.rebuild_license_health",
 	],
-# 	"hourly": [
-# 		"compliance_plus.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"compliance_plus.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"compliance_plus.tasks.monthly"
-# 	],
+	"hourly": [
+		"compliance_plus.compliance_plus.custom.license_tracker_cron.close_stale_runs",
+	],
+	"weekly": [
+		"compliance_plus.compliance_plus.custom.expiry_index.rebuild_expiry_index",
+	],
+	# 	"monthly": [
+	# 		"compliance_plus.tasks.monthly"
+	# 	],
 }
 
 # Testing
@@ -242,3 +344,7 @@ scheduler_events = {
 # 	"Logging DocType Name": 30  # days to retain logs
 # }
 
+default_log_clearing_doctypes = {
+	"Reminder Run Log": 90,
+	"Reminder Ledger": 365,
+}
@@ -0,0 +1,14 @@
+from compliance_plus.compliance_plus.custom.indexes import add_indexes
+from compliance_plus.compliance_plus.doctype.compliance_plus_settings.compliance_plus_settings import (
+	apply_prepared_report_setting,
+)
+
+
+def after_install():
+	# patches are not run on a fresh install
+	add_indexes()
+
+
+def after_migrate():
+	# migrate resets the standard report from its JSON, so re-apply the setting
+	apply_prepared_report_setting()
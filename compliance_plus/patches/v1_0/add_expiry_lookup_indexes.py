@@ -0,0 +1,5 @@
+from compliance_plus.compliance_plus.custom.indexes import add_indexes
+
+
+def execute():
+	add_indexes()
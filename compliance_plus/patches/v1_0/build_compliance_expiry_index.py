@@ -0,0 +1,7 @@
+from compliance_plus.compliance_plus.custom.expiry_index import rebuild_expiry_index
+from compliance_plus.compliance_plus.custom.indexes import add_indexes
+
+
+def execute():
+	add_indexes()
+	rebuild_expiry_index()
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import getdate
+
+from compliance_plus.compliance_plus.custom.indexes import add_indexes
+from compliance_plus.compliance_plus.custom.license_tracker_cron import (
+	get_expiring_licenses,
+	record_reminders,
+)
+
+
+def execute():
+	"""Seed the Reminder Ledger from the reminders already logged as Communications.
+
+	Without it, customers reminded just before the upgrade would be emailed again on the
+	first run, since the ledger starts out empty.
+	"""
+	add_indexes()
+
+	interval_days = frappe.db.get_single_value("Compliance Plus Settings", "set_interval") or 15
+	today = datetime.today().date()
+	last_sent = dict(
+		frappe.get_all(
+			"Communication",
+			filters={
+				"reference_doctype": "Customer",
+				"communication_type": "Automated Message",
+				"creation": [">", today - timedelta(days=interval_days)],
+			},
+			fields=["reference_name", "max(creation) as last_sent"],
+			group_by="reference_name",
+			as_list=True,
+		)
+	)
+	if not last_sent:
+		return
+
+	# the old check only ever looked at the expiry range of one run, so seeding that range is enough
+	until = today + timedelta(
+		days=frappe.db.get_single_value("Compliance Plus Settings", "expiry_threshold") or 15
+	)
+	reminders = {}
+	for doctype, license_type in (("Drug License Details", "Drug License"), ("FSSAI Details", "FSSAI")):
+		if not frappe.db.table_exists(doctype):
+			continue
+
+		for customer, licenses in get_expiring_licenses(doctype, today, until).items():
+			if customer not in last_sent:
+				continue
+			reminders.setdefault(getdate(last_sent[customer]), []).append(
+				frappe._dict(
+					reference_name=customer,
+					licenses=[(license_type, row.license_number, row.expiry_date) for row in licenses],
+				)
+			)
+
+	for sent_on, messages in reminders.items():
+		record_reminders(messages, sent_on=sent_on)
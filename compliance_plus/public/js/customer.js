@@ -0,0 +1,36 @@
+// Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+// For license information, please see license.txt
+
+frappe.provide("compliance_plus");
+
+compliance_plus.license_health_colors = {
+	"Expired": "red",
+	"Expiring Soon": "orange",
+	"Valid": "green"
+};
+
+frappe.ui.form.on("Customer", {
+	refresh: function(frm) {
+		if (frm.is_new()) {
+			return;
+		}
+
+		frappe.xcall("compliance_plus.compliance_plus.custom.license_health.get_license_health", {
+			customers: [frm.doc.name]
+		}).then(function(health) {
+			const summary = health[frm.doc.name];
+			if (!summary || !summary.state) {
+				return;
+			}
+
+			let label = __("Licences: {0}", [__(summary.state)]);
+			if (summary.expiring_count) {
+				label += " · " + __("{0} expiring", [summary.expiring_count]);
+			}
+			if (summary.next_expiry) {
+				label += " · " + __("next {0}", [frappe.datetime.str_to_user(summary.next_expiry)]);
+			}
+			frm.dashboard.add_indicator(label, compliance_plus.license_health_colors[summary.state]);
+		});
+	}
+});
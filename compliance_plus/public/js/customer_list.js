@@ -0,0 +1,46 @@
+// Copyright (c) 2025, KlyONIX Tech Consulting Pvt Ltd and contributors
+// For license information, please see license.txt
+
+(function() {
+	const colors = {
+		"Expired": "red",
+		"Expiring Soon": "orange",
+		"Valid": "green"
+	};
+	// extend the list settings ERPNext already defines for Customer
+	const settings = frappe.listview_settings["Customer"] = frappe.listview_settings["Customer"] || {};
+	const refresh = settings.refresh;
+
+	settings.refresh = function(listview) {
+		if (refresh) {
+			refresh(listview);
+		}
+
+		const customers = (listview.data || []).map((row) => row.name);
+		if (!customers.length) {
+			return;
+		}
+
+		// one call for the whole page, served from the licence health cache
+		frappe.xcall("compliance_plus.compliance_plus.custom.license_health.get_license_health", {
+			customers: customers
+		}).then(function(health) {
+			listview.$result.find(".license-health").remove();
+			listview.$result.find(".list-row-checkbox").each(function() {
+				const summary = health[$(this).attr("data-name")];
+				if (!summary || !summary.state || summary.state === "Valid") {
+					return;
+				}
+
+				const title = summary.next_expiry
+					? __("Next expiry {0}", [frappe.datetime.str_to_user(summary.next_expiry)])
+					: "";
+				$(this).closest(".list-row").find(".level-right").prepend(
+					`<span class="indicator-pill ${colors[summary.state]} license-health" title="${title}">
+						${__(summary.state)}
+					</span>`
+				);
+			});
+		});
+	};
+})();